@@ -415,6 +415,57 @@ downloads.get('/internal/next-task', internalServiceAuth, async (c) => {
     }
 });
 
+/**
+ * POST /api/internal/next-tasks
+ * Claim up to `limit` pending tasks in one round-trip (body: { limit })
+ * Auth: Internal Service Key
+ */
+downloads.post('/internal/next-tasks', internalServiceAuth, async (c) => {
+    try {
+        const body = await c.req.json<{ limit?: number }>().catch(() => ({} as { limit?: number }));
+        const limit = Math.min(Math.max(Number(body.limit) || 1, 1), 10);
+
+        // Claim and fetch in one statement so concurrent workers never get the same task
+        const { results } = await c.env.DB.prepare(
+            `UPDATE video_downloads SET status = 'processing'
+			 WHERE id IN (
+				 SELECT id FROM video_downloads
+				 WHERE status = 'pending'
+				 ORDER BY created_at ASC
+				 LIMIT ?
+			 )
+			 RETURNING id, user_id, tweet_url, twitter_cookies, task_type, tweet_id, video_url, metadata`
+        ).bind(limit).all<{
+            id: number;
+            user_id: string;
+            tweet_url: string;
+            twitter_cookies: string;
+            task_type: string;
+            tweet_id: string;
+            video_url: string;
+            metadata: string;
+        }>();
+
+        const tasks = (results || [])
+            .sort((a, b) => a.id - b.id)
+            .map((task) => ({
+                id: task.id,
+                user_id: task.user_id,
+                tweet_url: task.tweet_url,
+                cookies: task.twitter_cookies,
+                task_type: task.task_type || 'user_download',
+                tweet_id: task.tweet_id,
+                video_url: task.video_url,
+                metadata: task.metadata ? JSON.parse(task.metadata) : null
+            }));
+
+        return c.json({ tasks });
+    } catch (error) {
+        console.error('Get next tasks error:', error);
+        return c.json({ error: 'Internal server error' }, 500);
+    }
+});
+
 /**
  * PUT /api/internal/upload-url
  * Generate presigned URL for R2 upload
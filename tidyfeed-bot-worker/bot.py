@@ -6,20 +6,28 @@ Monitors Twitter notifications for @tidyfeedapp mentions.
 When users reply to a tweet with trigger words (save/keep/收藏/tidy),
 the target tweet is saved to their TidyFeed account.
 
-IMPORTANT: This bot manually parses the raw API response because
-twikit's get_notifications() parsing is broken for mentions.
+IMPORTANT: This bot calls twikit's low-level endpoints and parses the raw
+API response itself, because twikit's get_notifications() parsing is
+broken for mentions.
 """
 
 import os
+import re
 import sys
+import random
 import json
 import asyncio
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, Set
+from typing import Optional, Dict, Any, Set, Iterator, Tuple
 
-import requests
+import httpx
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads  # Accepts bytes too
 
 try:
     from dotenv import load_dotenv
@@ -38,12 +46,17 @@ BOT_USERNAME = os.environ.get('BOT_USERNAME', 'tidyfeedapp')
 BOT_COOKIES_PATH = os.environ.get('BOT_COOKIES_PATH', './cookies.json')
 
 POLL_SECONDS = int(os.environ.get('POLL_SECONDS', '60'))
+MENTIONS_COUNT = 40
+POLL_MIN_SECONDS = int(os.environ.get('POLL_MIN_SECONDS', POLL_SECONDS))
+POLL_MAX_SECONDS = int(os.environ.get('POLL_MAX_SECONDS', POLL_SECONDS))
+MAX_IDLE_BACKOFF = 4.0
 ERROR_SLEEP_SECONDS = 300
 
 PROCESSED_IDS_PATH = os.environ.get('PROCESSED_IDS_PATH', './processed_ids.json')
 MAX_STORED_IDS = 1000
 
 TRIGGER_WORDS = ['save', 'keep', '收藏', '保存', 'tidy', 'bookmark']
+_TRIGGER_RE = re.compile('|'.join(map(re.escape, TRIGGER_WORDS)), re.IGNORECASE)
 
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 logging.basicConfig(
@@ -58,10 +71,25 @@ logger = logging.getLogger(__name__)
 # Backend API
 # ============================================
 
-def call_bot_save(handle: str, tweet_url: str, mention_id: str = None,
-                  tweet_text: str = None, media_urls: list = None,
-                  author_handle: str = None, author_name: str = None,
-                  avatar_url: str = None) -> Dict[str, Any]:
+_BOT_SAVE_PATH = '/api/internal/bot-save'
+_BOT_STATUS_PATH = '/api/internal/bot-status'
+
+
+def create_backend_client() -> httpx.AsyncClient:
+    """Shared keep-alive HTTP/2 client for all backend calls."""
+    return httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        headers={'X-Service-Key': INTERNAL_SERVICE_KEY},
+        timeout=30,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4)
+    )
+
+
+async def call_bot_save(backend: httpx.AsyncClient, handle: str, tweet_url: str,
+                        mention_id: str = None, tweet_text: str = None,
+                        media_urls: list = None, author_handle: str = None,
+                        author_name: str = None, avatar_url: str = None) -> Dict[str, Any]:
     """
     Call backend API to save tweet. Backend handles deduplication via mention_id.
     """
@@ -76,41 +104,32 @@ def call_bot_save(handle: str, tweet_url: str, mention_id: str = None,
             'author_name': author_name,
             'avatar_url': avatar_url
         }
-        response = requests.post(
-            f'{API_BASE_URL}/api/internal/bot-save',
-            headers={'Content-Type': 'application/json', 'X-Service-Key': INTERNAL_SERVICE_KEY},
-            json=payload,
-            timeout=30
-        )
-        if response.ok:
-            return response.json()
+        response = await backend.post(_BOT_SAVE_PATH, json=payload)
+        if response.is_success:
+            return json_loads(response.content)
         else:
-            logger.error(f'Backend error: {response.status_code} - {response.text[:200]}')
+            logger.error('Backend error: %s - %s', response.status_code, response.text[:200])
             return {'success': False, 'error': f'HTTP {response.status_code}'}
     except Exception as e:
-        logger.error(f'Backend request failed: {e}')
+        logger.error('Backend request failed: %s', e)
         return {'success': False, 'error': str(e)}
 
 
-def check_bot_enabled() -> bool:
+async def check_bot_enabled(backend: httpx.AsyncClient) -> bool:
     """
     Check if bot is enabled via backend API.
     Returns True if enabled or on error (fail open to keep running), False if explicitly paused.
     """
     try:
-        response = requests.get(
-            f'{API_BASE_URL}/api/internal/bot-status',
-            headers={'X-Service-Key': INTERNAL_SERVICE_KEY},
-            timeout=10
-        )
-        if response.ok:
-            data = response.json()
+        response = await backend.get(_BOT_STATUS_PATH, timeout=10)
+        if response.is_success:
+            data = json_loads(response.content)
             return data.get('enabled', True)
         else:
-            logger.warning(f'⚠️ Failed to check bot status: HTTP {response.status_code}')
+            logger.warning('⚠️ Failed to check bot status: HTTP %s', response.status_code)
             return True  # Fail open
     except Exception as e:
-        logger.warning(f'⚠️ Failed to check bot status: {e}')
+        logger.warning('⚠️ Failed to check bot status: %s', e)
         return True  # Fail open
 
 
@@ -121,38 +140,25 @@ def check_bot_enabled() -> bool:
 def contains_trigger(text: str) -> bool:
     if not text:
         return False
-    text_lower = text.lower()
-    return any(t in text_lower for t in TRIGGER_WORDS)
+    return _TRIGGER_RE.search(text) is not None
 
 
-def parse_mentions_response(data: Dict) -> list:
+def iter_mentions(data: Dict) -> Iterator[Tuple[str, Dict, Dict]]:
     """
-    Parse raw mentions.json response from X API.
-    Returns list of mention tweets with user info.
+    Iterate save commands in a raw mentions.json response from X API.
+    Yields (tweet_id, tweet, user) using the raw dicts, skipping mentions
+    that are not replies or have no trigger word.
     """
-    mentions = []
+    global_objects = data.get('globalObjects', {})
+    tweets = global_objects.get('tweets', {})
+    users = global_objects.get('users', {})
     
-    try:
-        global_objects = data.get('globalObjects', {})
-        tweets = global_objects.get('tweets', {})
-        users = global_objects.get('users', {})
-        
-        for tweet_id, tweet in tweets.items():
-            user_id = tweet.get('user_id_str')
-            user = users.get(user_id, {})
-            
-            mentions.append({
-                'id': tweet_id,
-                'text': tweet.get('full_text', ''),
-                'user_handle': user.get('screen_name', ''),
-                'user_name': user.get('name', ''),
-                'in_reply_to_status_id': tweet.get('in_reply_to_status_id_str'),
-                'created_at': tweet.get('created_at')
-            })
-    except Exception as e:
-        logger.error(f'Error parsing mentions: {e}')
-    
-    return mentions
+    for tweet_id, tweet in tweets.items():
+        if not tweet.get('in_reply_to_status_id_str'):
+            continue
+        if not contains_trigger(tweet.get('full_text', '')):
+            continue
+        yield tweet_id, tweet, users.get(tweet.get('user_id_str'), {})
 
 
 # ============================================
@@ -160,8 +166,9 @@ def parse_mentions_response(data: Dict) -> list:
 # ============================================
 
 class TidyFeedBot:
-    def __init__(self):
+    def __init__(self, backend: httpx.AsyncClient):
         self.client = None
+        self.backend = backend
         self._authenticated = False
     
     async def initialize(self) -> bool:
@@ -172,10 +179,10 @@ class TidyFeedBot:
             cookies_path = Path(BOT_COOKIES_PATH)
             
             if not cookies_path.exists():
-                logger.error(f'❌ Cookies not found: {BOT_COOKIES_PATH}')
+                logger.error('❌ Cookies not found: %s', BOT_COOKIES_PATH)
                 return False
             
-            logger.info(f'🔐 Loading cookies from {BOT_COOKIES_PATH}...')
+            logger.info('🔐 Loading cookies from %s...', BOT_COOKIES_PATH)
             self.client.load_cookies(str(cookies_path))
             logger.info('✅ Cookies loaded')
             
@@ -183,45 +190,24 @@ class TidyFeedBot:
             return True
             
         except Exception as e:
-            logger.error(f'❌ Failed to initialize: {e}')
+            logger.error('❌ Failed to initialize: %s', e)
             return False
     
-    async def fetch_mentions_raw(self) -> list:
+    async def fetch_mentions_raw(self) -> Optional[Dict]:
         """
-        Fetch mentions by intercepting twikit's internal HTTP request.
+        Fetch the raw mentions.json response.
         
-        We call get_notifications() which triggers proper initialization,
-        but we patch the client to capture the raw response for parsing.
+        Calls twikit's v11 endpoint directly so we skip get_notifications()'
+        model parsing; the request still goes through the client's
+        authenticated request path.
         """
         try:
-            import twikit.client.client as client_module
-            
-            # Patch to capture raw response
-            captured_data = {}
-            original_request = client_module.Client.request
-            
-            async def patched_request(self_client, method, url, **kwargs):
-                result = await original_request(self_client, method, url, **kwargs)
-                if 'mentions' in str(url):
-                    captured_data['response'] = result[0] if result else None
-                return result
-            
-            client_module.Client.request = patched_request
-            
-            try:
-                # This triggers initialization and makes the actual request
-                await self.client.get_notifications('mentions')
-            finally:
-                # Restore original method
-                client_module.Client.request = original_request
-            
-            if 'response' in captured_data and captured_data['response']:
-                return parse_mentions_response(captured_data['response'])
-            return []
+            response, _ = await self.client.v11.notifications_mentions(MENTIONS_COUNT, None)
+            return response
             
         except Exception as e:
-            logger.error(f'Error fetching mentions: {e}')
-            return []
+            logger.error('Error fetching mentions: %s', e)
+            return None
     
     async def poll_once(self) -> int:
         if not self._authenticated:
@@ -229,53 +215,59 @@ class TidyFeedBot:
         
         try:
             logger.debug('🔍 Fetching mentions...')
-            mentions = await self.fetch_mentions_raw()
+            data = await self.fetch_mentions_raw()
             
-            if not mentions:
+            if not data:
                 logger.debug('No mentions found')
                 return 0
             
-            logger.info(f'📬 Found {len(mentions)} mention(s)')
+            commands = list(iter_mentions(data))
+            if not commands:
+                logger.debug('No save commands found')
+                return 0
+            
+            logger.info('📬 Found %s save command(s)', len(commands))
             
-            processed = 0
-            for mention in mentions:
-                if await self._process_mention(mention):
-                    processed += 1
+            # Fetch all target tweets (the ones being replied to) concurrently
+            targets = await asyncio.gather(
+                *(self._fetch_tweet(tweet['in_reply_to_status_id_str']) for _, tweet, _ in commands),
+                return_exceptions=True
+            )
+            results = await asyncio.gather(
+                *(
+                    self._process_mention(tweet_id, tweet, user,
+                                          None if isinstance(target, BaseException) else target)
+                    for (tweet_id, tweet, user), target in zip(commands, targets)
+                ),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error('❌ Process error: %s', result)
             
-            return processed
+            return sum(1 for result in results if result is True)
             
         except Exception as e:
-            logger.error(f'❌ Poll error: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.exception('❌ Poll error: %s', e)
             return 0
     
-    async def _process_mention(self, mention: Dict) -> bool:
-        tweet_id = mention['id']
-        text = mention.get('text', '')
-        sender = mention.get('user_handle', '')
-        reply_to = mention.get('in_reply_to_status_id')
+    async def _process_mention(self, tweet_id: str, tweet: Dict, user: Dict,
+                               target_tweet: Optional[Dict]) -> bool:
+        """
+        Handle a save command; iter_mentions has already checked trigger and reply.
+        target_tweet is the pre-fetched tweet being replied to, or None if unavailable.
+        """
+        text = tweet.get('full_text', '')
+        sender = user.get('screen_name', '')
+        reply_to = tweet['in_reply_to_status_id_str']
         
         # Debug: log mention details
-        logger.info(f'🔍 Checking mention: id={tweet_id}, from=@{sender}')
-        logger.info(f'   Text: "{text[:80]}..."')
-        logger.info(f'   Reply to: {reply_to}')
-        
-        # Check for trigger words (skip without marking - no trigger = not our concern)
-        if not contains_trigger(text):
-            logger.debug(f'   ⏭️ Skipped: no trigger word found')
-            return False
+        logger.info('🔍 Checking mention: id=%s, from=@%s', tweet_id, sender)
+        logger.info('   Text: "%s..."', text[:80])
+        logger.info('   Reply to: %s', reply_to)
         
-        # Must be a reply to another tweet (skip without marking)
-        if not reply_to:
-            logger.debug(f'   ⏭️ Skipped: not a reply')
-            return False
-        
-        logger.info(f'📥 Save command from @{sender}')
-        logger.info(f'   Target tweet ID: {reply_to}')
-        
-        # Fetch the TARGET tweet (the one being replied to - this is what we want to save)
-        target_tweet = await self._fetch_tweet(reply_to)
+        logger.info('📥 Save command from @%s', sender)
+        logger.info('   Target tweet ID: %s', reply_to)
         
         if target_tweet:
             target_url = f"https://x.com/{target_tweet.get('author_handle', 'i')}/status/{reply_to}"
@@ -285,8 +277,8 @@ class TidyFeedBot:
             target_avatar = target_tweet.get('avatar_url', '')
             target_media = target_tweet.get('media_urls', [])
 
-            logger.info(f'   Target author: @{target_author}')
-            logger.info(f'   Target text: "{target_text[:60]}..."')
+            logger.info('   Target author: @%s', target_author)
+            logger.info('   Target text: "%s..."', target_text[:60])
         else:
             # Fallback if we can't fetch the tweet
             target_url = f'https://x.com/i/status/{reply_to}'
@@ -295,10 +287,11 @@ class TidyFeedBot:
             target_author_name = None
             target_avatar = None
             target_media = []
-            logger.warning(f'   ⚠️ Could not fetch target tweet, saving URL only')
+            logger.warning('   ⚠️ Could not fetch target tweet, saving URL only')
 
         # Call backend API with target tweet info (backend handles deduplication)
-        result = call_bot_save(
+        result = await call_bot_save(
+            self.backend,
             handle=sender,
             tweet_url=target_url,
             mention_id=tweet_id,  # Backend marks as processed
@@ -311,55 +304,38 @@ class TidyFeedBot:
         
         if result.get('success'):
             if result.get('already_processed'):
-                logger.info(f'   ⏭️ Skipped: already processed')
+                logger.info('   ⏭️ Skipped: already processed')
                 return False
             
             if result.get('user_found'):
                 if result.get('saved'):
-                    logger.info(f'✅ Saved for @{sender}')
+                    logger.info('✅ Saved for @%s', sender)
                 elif result.get('already_saved'):
-                    logger.info(f'ℹ️ Already saved for @{sender}')
+                    logger.info('ℹ️ Already saved for @%s', sender)
                 
                 # Like the tweet to acknowledge
                 await self._like_tweet(tweet_id)
                 return True
             else:
-                logger.info(f'⚠️ @{sender} not linked to TidyFeed')
+                logger.info('⚠️ @%s not linked to TidyFeed', sender)
                 return False
         else:
-            logger.error(f'❌ Backend error: {result.get("error", "unknown")}')
+            logger.error('❌ Backend error: %s', result.get("error", "unknown"))
             return False
     
     async def _fetch_tweet(self, tweet_id: str) -> Optional[Dict]:
-        """Fetch a tweet by ID by intercepting twikit's raw response."""
-        import twikit.client.client as client_module
-        
-        # Capture raw response
-        captured_data = {}
-        original_request = client_module.Client.request
-        
-        async def patched_request(self_client, method, url, **kwargs):
-            result = await original_request(self_client, method, url, **kwargs)
-            if 'TweetDetail' in str(url):
-                captured_data['response'] = result[0] if result else None
-            return result
-        
-        client_module.Client.request = patched_request
-        
+        """Fetch a tweet by ID via twikit's raw TweetDetail GraphQL call."""
         try:
-            await self.client.get_tweet_by_id(tweet_id)
+            response, _ = await self.client.gql.tweet_detail(tweet_id, None)
         except Exception as e:
-            # twikit may throw parsing errors, but we have the raw data
-            logger.debug(f'twikit error (expected): {e}')
-        finally:
-            client_module.Client.request = original_request
+            logger.warning('Failed to fetch tweet %s: %s', tweet_id, e)
+            return None
         
-        # Parse our captured data regardless of twikit errors
-        if 'response' in captured_data and captured_data['response']:
+        if response:
             try:
-                return self._parse_tweet_detail(captured_data['response'], tweet_id)
+                return self._parse_tweet_detail(response, tweet_id)
             except Exception as e:
-                logger.warning(f'Failed to parse tweet {tweet_id}: {e}')
+                logger.warning('Failed to parse tweet %s: %s', tweet_id, e)
         
         return None
     
@@ -370,38 +346,31 @@ class TidyFeedBot:
             tc = data.get('data', {}).get('threaded_conversation_with_injections_v2', {})
             instructions = tc.get('instructions', [])
             
+            needle = f'tweet-{target_id}'
+            
             for instruction in instructions:
                 if instruction.get('type') == 'TimelineAddEntries':
                     entries = instruction.get('entries', [])
+                    if not entries:
+                        break
                     
-                    # The focal tweet is the first entry
-                    for entry in entries:
-                        entry_id = entry.get('entryId', '')
-                        
-                        # Check if this is the target tweet entry
-                        if f'tweet-{target_id}' in entry_id:
-                            content = entry.get('content', {})
-                            item_content = content.get('itemContent', {})
-                            tweet_results = item_content.get('tweet_results', {})
-                            result = tweet_results.get('result', {})
-                            
-                            if result:
-                                return self._extract_tweet_from_result(result)
+                    # The focal tweet is almost always the first entry; only scan the
+                    # thread on a miss, and fall back to the first entry if not found
+                    entry = entries[0]
+                    if needle not in entry.get('entryId', ''):
+                        entry = next((e for e in entries if needle in e.get('entryId', '')), entry)
                     
-                    # Fallback: just try the first tweet entry
-                    if entries:
-                        first_entry = entries[0]
-                        content = first_entry.get('content', {})
-                        item_content = content.get('itemContent', {})
-                        tweet_results = item_content.get('tweet_results', {})
-                        result = tweet_results.get('result', {})
-                        
-                        if result:
-                            return self._extract_tweet_from_result(result)
+                    content = entry.get('content', {})
+                    item_content = content.get('itemContent', {})
+                    tweet_results = item_content.get('tweet_results', {})
+                    result = tweet_results.get('result', {})
+                    
+                    if result:
+                        return self._extract_tweet_from_result(result)
                     break
                     
         except Exception as e:
-            logger.warning(f'Failed to parse tweet detail: {e}')
+            logger.warning('Failed to parse tweet detail: %s', e)
         return None
     
     def _extract_tweet_from_result(self, result: Dict) -> Optional[Dict]:
@@ -413,12 +382,10 @@ class TidyFeedBot:
             user_legacy = user_results.get('legacy', {})
             
             # Get media URLs
-            media_urls = []
-            media_items = legacy.get('extended_entities', {}).get('media', [])
-            for m in media_items:
-                url = m.get('media_url_https') or m.get('url')
-                if url:
-                    media_urls.append(url)
+            media_urls = [
+                url for m in legacy.get('extended_entities', {}).get('media', ())
+                if (url := m.get('media_url_https') or m.get('url'))
+            ]
             
             # Get avatar URL (replace _normal with _bigger for higher quality)
             avatar_url = user_legacy.get('profile_image_url_https', '')
@@ -434,28 +401,37 @@ class TidyFeedBot:
                 'media_urls': media_urls
             }
         except Exception as e:
-            logger.warning(f'Failed to extract tweet: {e}')
+            logger.warning('Failed to extract tweet: %s', e)
         return None
     
     async def _like_tweet(self, tweet_id: str):
         try:
             await self.client.favorite_tweet(tweet_id)
-            logger.debug(f'❤️ Liked tweet {tweet_id}')
+            logger.debug('❤️ Liked tweet %s', tweet_id)
         except Exception as e:
-            logger.warning(f'Failed to like tweet: {e}')
+            logger.warning('Failed to like tweet: %s', e)
 
 
 # ============================================
 # Main Loop
 # ============================================
 
+def next_poll_delay(empty_streak: int) -> float:
+    """
+    Jittered poll delay in [POLL_MIN_SECONDS, POLL_MAX_SECONDS], stretched by
+    1.5x per consecutive idle poll (capped at MAX_IDLE_BACKOFF) while quiet.
+    """
+    delay = POLL_MIN_SECONDS + (POLL_MAX_SECONDS - POLL_MIN_SECONDS) * random.random()
+    return delay * min(1.5 ** empty_streak, MAX_IDLE_BACKOFF)
+
+
 async def run_bot():
     logger.info('=' * 60)
     logger.info('🤖 TidyFeed Bot Worker')
-    logger.info(f'   API: {API_BASE_URL}')
-    logger.info(f'   Bot: @{BOT_USERNAME}')
-    logger.info(f'   Poll interval: {POLL_SECONDS}s')
-    logger.info(f'   Triggers: {TRIGGER_WORDS}')
+    logger.info('   API: %s', API_BASE_URL)
+    logger.info('   Bot: @%s', BOT_USERNAME)
+    logger.info('   Poll interval: %s-%ss', POLL_MIN_SECONDS, POLL_MAX_SECONDS)
+    logger.info('   Triggers: %s', TRIGGER_WORDS)
     logger.info('=' * 60)
     
     if not INTERNAL_SERVICE_KEY:
@@ -465,50 +441,58 @@ async def run_bot():
     # Wait for cookies file (allows time to upload via fly ssh sftp)
     cookies_path = Path(BOT_COOKIES_PATH)
     if not cookies_path.exists():
-        logger.warning(f'⏳ Waiting for cookies at {BOT_COOKIES_PATH}...')
+        logger.warning('⏳ Waiting for cookies at %s...', BOT_COOKIES_PATH)
         logger.warning('   Upload via: fly ssh sftp shell -> put cookies.json /data/cookies.json')
         while not cookies_path.exists():
             await asyncio.sleep(30)
-            logger.info(f'⏳ Still waiting for {BOT_COOKIES_PATH}...')
+            logger.info('⏳ Still waiting for %s...', BOT_COOKIES_PATH)
         logger.info('✅ Cookies file found!')
     
-    bot = TidyFeedBot()
-    
-    if not await bot.initialize():
-        logger.error('❌ Failed to initialize bot')
-        sys.exit(1)
-    
-    logger.info('🚀 Bot started, polling for mentions...')
-    
-    while True:
-        try:
-            # Check pause status
-            if not check_bot_enabled():
-                logger.info('⏸️ Bot execution paused by system setting. Sleeping...')
-                await asyncio.sleep(POLL_SECONDS)
-                continue
+    async with create_backend_client() as backend:
+        bot = TidyFeedBot(backend)
+        
+        if not await bot.initialize():
+            logger.error('❌ Failed to initialize bot')
+            sys.exit(1)
+        
+        logger.info('🚀 Bot started, polling for mentions...')
+        
+        empty_streak = 0
+        while True:
+            try:
+                # Check pause status
+                if not await check_bot_enabled(backend):
+                    logger.info('⏸️ Bot execution paused by system setting. Sleeping...')
+                    await asyncio.sleep(POLL_SECONDS)
+                    continue
 
-            processed = await bot.poll_once()
-            
-            if processed > 0:
-                logger.info(f'✅ Processed {processed} command(s)')
-            
-            logger.debug(f'💤 Sleeping {POLL_SECONDS}s')
-            await asyncio.sleep(POLL_SECONDS)
-            
-        except KeyboardInterrupt:
-            logger.info('👋 Shutting down...')
-            bot.state.save()
-            break
-            
-        except Exception as e:
-            logger.error(f'❌ Unexpected error: {e}')
-            import traceback
-            traceback.print_exc()
-            await asyncio.sleep(60)
+                processed = await bot.poll_once()
+                
+                if processed > 0:
+                    logger.info('✅ Processed %s command(s)', processed)
+                
+                empty_streak = 0 if processed > 0 else empty_streak + 1
+                delay = next_poll_delay(empty_streak)
+                logger.debug('💤 Sleeping %.1fs', delay)
+                await asyncio.sleep(delay)
+                
+            except KeyboardInterrupt:
+                logger.info('👋 Shutting down...')
+                bot.state.save()
+                break
+                
+            except Exception as e:
+                logger.exception('❌ Unexpected error: %s', e)
+                await asyncio.sleep(60)
 
 
 def main():
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(run_bot())
     except KeyboardInterrupt:
@@ -7,16 +7,24 @@ which has become unreliable due to Cloudflare blocking.
 """
 
 import os
+import re
 import sys
+import random
 import json
+import math
+import pickle
+import hashlib
 import asyncio
 import logging
 import httpx
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Set
+from typing import Optional, Dict, Any, List
 
-import requests
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads  # Accepts bytes too
 
 # Load environment variables
 try:
@@ -36,12 +44,16 @@ BOT_USERNAME = os.environ.get('BOT_USERNAME', 'tidyfeedapp')
 BOT_COOKIES_PATH = os.environ.get('BOT_COOKIES_PATH', './cookies.json')
 
 POLL_SECONDS = int(os.environ.get('POLL_SECONDS', '60'))
+POLL_MIN_SECONDS = int(os.environ.get('POLL_MIN_SECONDS', POLL_SECONDS))
+POLL_MAX_SECONDS = int(os.environ.get('POLL_MAX_SECONDS', POLL_SECONDS))
+MAX_IDLE_BACKOFF = 4.0
 ERROR_SLEEP_SECONDS = 300
 
-PROCESSED_IDS_PATH = os.environ.get('PROCESSED_IDS_PATH', './processed_ids.json')
+PROCESSED_IDS_PATH = os.environ.get('PROCESSED_IDS_PATH', './processed_ids.pickle')
 MAX_STORED_IDS = 1000
 
 TRIGGER_WORDS = ['save', 'keep', '收藏', '保存', 'tidy', 'bookmark']
+_TRIGGER_RE = re.compile('|'.join(map(re.escape, TRIGGER_WORDS)), re.IGNORECASE)
 
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
 logging.basicConfig(
@@ -59,52 +71,136 @@ X_BEARER_TOKEN = 'AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs=1Z
 # State Management
 # ============================================
 
+class BloomFilter:
+    """Fixed-capacity Bloom filter; bit positions come from one blake2b digest."""
+    
+    def __init__(self, capacity: int = MAX_STORED_IDS, error_rate: float = 1e-4):
+        self.num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+    
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+    
+    def add(self, key: str):
+        if key in self:
+            return
+        for p in self._positions(key):
+            self.bits[p >> 3] |= 1 << (p & 7)
+        self.count += 1
+    
+    def dump(self) -> tuple:
+        return bytes(self.bits), self.count
+    
+    def restore(self, state: tuple):
+        bits, count = state
+        if len(bits) == len(self.bits):
+            self.bits = bytearray(bits)
+            self.count = count
+
+
 class StateManager:
+    """
+    Remembers processed tweet IDs in two rotating Bloom filters.
+    
+    Once the current filter holds MAX_STORED_IDS entries it becomes the
+    previous one, so roughly the last 1-2k IDs are remembered at a
+    constant few KB. A false positive only skips a rare mention.
+    """
+    
     def __init__(self, filepath: str = PROCESSED_IDS_PATH):
         self.filepath = Path(filepath)
-        self.processed_ids: Set[str] = set()
+        # Pre-pickle JSON state next to it, migrated on load and removed on the next save
+        self.legacy_path = self.filepath.with_suffix('.json')
+        self._current = BloomFilter()
+        self._previous = BloomFilter()
+        self._dirty = False
         self._load()
     
     def _load(self):
-        if self.filepath.exists():
-            try:
-                with open(self.filepath, 'r') as f:
-                    data = json.load(f)
-                    self.processed_ids = set(data.get('ids', []))
-            except:
-                self.processed_ids = set()
+        try:
+            if self.filepath.exists():
+                with open(self.filepath, 'rb') as f:
+                    data = pickle.load(f)
+                self._current.restore(data['current'])
+                self._previous.restore(data['previous'])
+            elif self.legacy_path.exists():
+                # Legacy JSON state: {"ids": [...]}; marking sets _dirty so it is rewritten as pickle
+                for id in json_loads(self.legacy_path.read_bytes()).get('ids', []):
+                    self.mark_processed(id)
+        except Exception as e:
+            logger.warning('Failed to load state: %s', e)
+            self._current = BloomFilter()
+            self._previous = BloomFilter()
     
     def save(self):
+        """Persist state if it changed, via temp file + rename so a crash can't tear it."""
+        if not self._dirty:
+            return
         try:
-            ids_list = list(self.processed_ids)[-MAX_STORED_IDS:]
-            self.processed_ids = set(ids_list)
-            with open(self.filepath, 'w') as f:
-                json.dump({'ids': ids_list, 'updated_at': datetime.utcnow().isoformat()}, f)
+            tmp_path = self.filepath.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                pickle.dump({
+                    'current': self._current.dump(),
+                    'previous': self._previous.dump(),
+                    'updated_at': datetime.utcnow().isoformat()
+                }, f)
+            os.replace(tmp_path, self.filepath)
+            if self.legacy_path != self.filepath:
+                self.legacy_path.unlink(missing_ok=True)
+            self._dirty = False
         except Exception as e:
-            logger.warning(f'Failed to save state: {e}')
+            logger.warning('Failed to save state: %s', e)
     
     def is_processed(self, id: str) -> bool:
-        return id in self.processed_ids
+        return id in self._current or id in self._previous
     
     def mark_processed(self, id: str):
-        self.processed_ids.add(id)
+        if self._current.count >= MAX_STORED_IDS:
+            self._previous, self._current = self._current, BloomFilter()
+        self._current.add(id)
+        self._dirty = True
 
 
 # ============================================
 # Backend API
 # ============================================
 
-def call_bot_save(handle: str, tweet_url: str, tweet_text: str = None) -> Dict[str, Any]:
+_BOT_SAVE_URL = f'{API_BASE_URL}/api/internal/bot-save'
+_BACKEND_HEADERS = {'X-Service-Key': INTERNAL_SERVICE_KEY}
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Shared keep-alive HTTP/2 client for both the backend and X API.
+    Auth headers are passed per request, since the two hosts differ.
+    """
+    return httpx.AsyncClient(
+        timeout=30.0,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4)
+    )
+
+
+async def call_bot_save(http: httpx.AsyncClient, handle: str, tweet_url: str,
+                        tweet_text: str = None) -> Dict[str, Any]:
     try:
-        response = requests.post(
-            f'{API_BASE_URL}/api/internal/bot-save',
-            headers={'Content-Type': 'application/json', 'X-Service-Key': INTERNAL_SERVICE_KEY},
-            json={'handle': handle, 'tweet_url': tweet_url, 'tweet_text': tweet_text},
-            timeout=30
+        response = await http.post(
+            _BOT_SAVE_URL,
+            headers=_BACKEND_HEADERS,
+            json={'handle': handle, 'tweet_url': tweet_url, 'tweet_text': tweet_text}
         )
-        return response.json() if response.ok else {'success': False, 'error': f'HTTP {response.status_code}'}
+        return json_loads(response.content) if response.is_success else {'success': False, 'error': f'HTTP {response.status_code}'}
     except Exception as e:
-        logger.error(f'Backend error: {e}')
+        logger.error('Backend error: %s', e)
         return {'success': False, 'error': str(e)}
 
 
@@ -115,36 +211,34 @@ def call_bot_save(handle: str, tweet_url: str, tweet_text: str = None) -> Dict[s
 class XApiClient:
     """Direct X API client using cookies for authentication."""
     
-    def __init__(self, cookies_path: str):
-        self.cookies = {}
+    def __init__(self, cookies_path: str, http: httpx.AsyncClient):
         self.ct0 = ''
         self.auth_token = ''
+        self._request_headers: Dict[str, str] = {}
         self._load_cookies(cookies_path)
         
-        self.http = httpx.AsyncClient(
-            headers={
-                'Authorization': f'Bearer {X_BEARER_TOKEN}',
-                'x-twitter-active-user': 'yes',
-                'x-twitter-client-language': 'en',
-            },
-            timeout=30.0
-        )
+        self.http = http
     
     def _load_cookies(self, path: str):
-        with open(path, 'r') as f:
-            self.cookies = json.load(f)
-        self.auth_token = self.cookies.get('auth_token', '')
-        self.ct0 = self.cookies.get('ct0', '')
-        logger.info(f'Loaded cookies: auth_token={self.auth_token[:10]}..., ct0={self.ct0[:10]}...')
-    
-    def _get_headers(self) -> Dict[str, str]:
-        return {
+        with open(path, 'rb') as f:
+            cookies = json_loads(f.read())
+        # Only auth_token and ct0 are used; don't keep the rest of the cookie jar around
+        self.auth_token = cookies.get('auth_token', '')
+        self.ct0 = cookies.get('ct0', '')
+        logger.info('Loaded cookies: auth_token=%s..., ct0=%s...', self.auth_token[:10], self.ct0[:10])
+        
+        # Cookies don't change for the process lifetime, so build request headers once
+        self._request_headers = {
             'Authorization': f'Bearer {X_BEARER_TOKEN}',
             'x-csrf-token': self.ct0,
             'x-twitter-active-user': 'yes',
+            'x-twitter-client-language': 'en',
             'cookie': f'auth_token={self.auth_token}; ct0={self.ct0}'
         }
     
+    def _get_headers(self) -> Dict[str, str]:
+        return self._request_headers
+    
     async def search_mentions(self, username: str) -> List[Dict]:
         """
         Search for recent tweets mentioning @username.
@@ -175,14 +269,14 @@ class XApiClient:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = json_loads(response.content)
                 return self._parse_search_results(data)
             else:
-                logger.warning(f'Search API returned {response.status_code}')
+                logger.warning('Search API returned %s', response.status_code)
                 return []
                 
         except Exception as e:
-            logger.error(f'Search error: {e}')
+            logger.error('Search error: %s', e)
             return []
     
     def _parse_search_results(self, data: Dict) -> List[Dict]:
@@ -206,7 +300,7 @@ class XApiClient:
                     'created_at': tweet.get('created_at')
                 })
         except Exception as e:
-            logger.error(f'Parse error: {e}')
+            logger.error('Parse error: %s', e)
         
         return tweets
     
@@ -221,7 +315,7 @@ class XApiClient:
             )
             return response.status_code == 200
         except Exception as e:
-            logger.warning(f'Like failed: {e}')
+            logger.warning('Like failed: %s', e)
             return False
 
 
@@ -230,21 +324,21 @@ class XApiClient:
 # ============================================
 
 def contains_trigger(text: str) -> bool:
-    text_lower = text.lower()
-    return any(t in text_lower for t in TRIGGER_WORDS)
+    return _TRIGGER_RE.search(text) is not None
 
 
 class TidyFeedBot:
-    def __init__(self):
+    def __init__(self, http: httpx.AsyncClient):
+        self.http = http
         self.client = None
         self.state = StateManager()
     
     async def initialize(self) -> bool:
         try:
-            self.client = XApiClient(BOT_COOKIES_PATH)
+            self.client = XApiClient(BOT_COOKIES_PATH, self.http)
             return True
         except Exception as e:
-            logger.error(f'Init failed: {e}')
+            logger.error('Init failed: %s', e)
             return False
     
     async def poll_once(self) -> int:
@@ -252,63 +346,66 @@ class TidyFeedBot:
             return 0
         
         try:
-            logger.debug(f'Searching for @{BOT_USERNAME} mentions...')
+            logger.debug('Searching for @%s mentions...', BOT_USERNAME)
             tweets = await self.client.search_mentions(BOT_USERNAME)
             
             if not tweets:
                 logger.debug('No results from search')
                 return 0
             
-            logger.info(f'Found {len(tweets)} tweets mentioning @{BOT_USERNAME}')
+            logger.info('Found %s tweets mentioning @%s', len(tweets), BOT_USERNAME)
+            
+            # Reject in cheap passes before any per-tweet RPC
+            fresh = [t for t in tweets if not self.state.is_processed(t['id'])]
+            with_reply = [t for t in fresh if t.get('in_reply_to_status_id')]
+            save_cmds = [t for t in with_reply if contains_trigger(t.get('text', ''))]
             
-            processed = 0
-            for tweet in tweets:
-                if await self._process_tweet(tweet):
-                    processed += 1
+            # Rejected mentions can never become commands; remember them so they aren't rechecked
+            save_ids = {t['id'] for t in save_cmds}
+            for t in fresh:
+                if t['id'] not in save_ids:
+                    self.state.mark_processed(t['id'])
+            
+            results = await asyncio.gather(
+                *(self._process_tweet(tweet) for tweet in save_cmds),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error('Process error: %s', result)
+            processed = sum(1 for result in results if result is True)
             
             self.state.save()
             return processed
             
         except Exception as e:
-            logger.error(f'Poll error: {e}')
+            logger.error('Poll error: %s', e)
             return 0
     
     async def _process_tweet(self, tweet: Dict) -> bool:
+        """Handle a save command; poll_once has already filtered out non-commands."""
         tweet_id = tweet['id']
-        
-        if self.state.is_processed(tweet_id):
-            return False
-        
         text = tweet.get('text', '')
         sender = tweet.get('user_handle', '')
-        reply_to = tweet.get('in_reply_to_status_id')
-        
-        if not contains_trigger(text):
-            self.state.mark_processed(tweet_id)
-            return False
-        
-        if not reply_to:
-            logger.debug(f'@{sender} mention is not a reply, skipping')
-            self.state.mark_processed(tweet_id)
-            return False
+        reply_to = tweet['in_reply_to_status_id']
         
         target_url = f'https://x.com/i/status/{reply_to}'
         
-        logger.info(f'📥 Save command from @{sender}')
-        logger.info(f'   Target: {target_url}')
-        logger.info(f'   Text: "{text[:50]}..."')
+        logger.info('📥 Save command from @%s', sender)
+        logger.info('   Target: %s', target_url)
+        logger.info('   Text: "%s..."', text[:50])
         
-        result = call_bot_save(sender, target_url, text)
+        result = await call_bot_save(self.http, sender, target_url, text)
         self.state.mark_processed(tweet_id)
         
         if result.get('success') and result.get('user_found'):
-            logger.info(f'✅ Saved for @{sender}')
+            logger.info('✅ Saved for @%s', sender)
             await self.client.like_tweet(tweet_id)
             return True
         elif result.get('success'):
-            logger.info(f'⚠️ @{sender} not linked to TidyFeed')
+            logger.info('⚠️ @%s not linked to TidyFeed', sender)
         else:
-            logger.error(f'❌ Backend error: {result.get("error")}')
+            logger.error('❌ Backend error: %s', result.get("error"))
         
         return False
 
@@ -317,13 +414,22 @@ class TidyFeedBot:
 # Main
 # ============================================
 
+def next_poll_delay(empty_streak: int) -> float:
+    """
+    Jittered poll delay in [POLL_MIN_SECONDS, POLL_MAX_SECONDS], stretched by
+    1.5x per consecutive idle poll (capped at MAX_IDLE_BACKOFF) while quiet.
+    """
+    delay = POLL_MIN_SECONDS + (POLL_MAX_SECONDS - POLL_MIN_SECONDS) * random.random()
+    return delay * min(1.5 ** empty_streak, MAX_IDLE_BACKOFF)
+
+
 async def run_bot():
     logger.info('=' * 60)
     logger.info('🤖 TidyFeed Bot Worker (Direct API)')
-    logger.info(f'   API: {API_BASE_URL}')
-    logger.info(f'   Bot: @{BOT_USERNAME}')
-    logger.info(f'   Poll interval: {POLL_SECONDS}s')
-    logger.info(f'   Triggers: {TRIGGER_WORDS}')
+    logger.info('   API: %s', API_BASE_URL)
+    logger.info('   Bot: @%s', BOT_USERNAME)
+    logger.info('   Poll interval: %s-%ss', POLL_MIN_SECONDS, POLL_MAX_SECONDS)
+    logger.info('   Triggers: %s', TRIGGER_WORDS)
     logger.info('=' * 60)
     
     if not INTERNAL_SERVICE_KEY:
@@ -331,33 +437,43 @@ async def run_bot():
         sys.exit(1)
     
     if not Path(BOT_COOKIES_PATH).exists():
-        logger.error(f'❌ Cookies not found: {BOT_COOKIES_PATH}')
-        sys.exit(1)
-    
-    bot = TidyFeedBot()
-    if not await bot.initialize():
+        logger.error('❌ Cookies not found: %s', BOT_COOKIES_PATH)
         sys.exit(1)
     
-    logger.info('🚀 Bot started')
-    
-    while True:
-        try:
-            processed = await bot.poll_once()
-            if processed > 0:
-                logger.info(f'✅ Processed {processed} command(s)')
-            
-            logger.debug(f'💤 Sleeping {POLL_SECONDS}s')
-            await asyncio.sleep(POLL_SECONDS)
-            
-        except KeyboardInterrupt:
-            logger.info('👋 Shutting down')
-            break
-        except Exception as e:
-            logger.error(f'❌ Error: {e}')
-            await asyncio.sleep(60)
+    async with create_http_client() as http:
+        bot = TidyFeedBot(http)
+        if not await bot.initialize():
+            sys.exit(1)
+        
+        logger.info('🚀 Bot started')
+        
+        empty_streak = 0
+        while True:
+            try:
+                processed = await bot.poll_once()
+                if processed > 0:
+                    logger.info('✅ Processed %s command(s)', processed)
+                
+                empty_streak = 0 if processed > 0 else empty_streak + 1
+                delay = next_poll_delay(empty_streak)
+                logger.debug('💤 Sleeping %.1fs', delay)
+                await asyncio.sleep(delay)
+                
+            except KeyboardInterrupt:
+                logger.info('👋 Shutting down')
+                break
+            except Exception as e:
+                logger.error('❌ Error: %s', e)
+                await asyncio.sleep(60)
 
 
 def main():
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     try:
         asyncio.run(run_bot())
     except KeyboardInterrupt:
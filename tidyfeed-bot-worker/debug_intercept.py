@@ -4,85 +4,94 @@ Intercept and save raw twikit HTTP response
 """
 
 import os
+import sys
+import re
 import json
 import asyncio
 from pathlib import Path
 
 try:
-    from dotenv import load_dotenv
-    load_dotenv()
+    import orjson
+
+    def _dump(obj, path: str):
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
 except ImportError:
-    pass
+    def _dump(obj, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
 
 BOT_COOKIES_PATH = './cookies.json'
 
+# Matched against url.raw_path (bytes), so no per-response path decoding
+_is_target = re.compile(rb'mentions').search
+
 
 async def main():
     from twikit import Client
-    import twikit.client.client as client_module
-    
-    # Patch the request method to capture response
-    original_request = client_module.Client.request
-    captured_responses = []
     
-    async def patched_request(self, method, url, **kwargs):
-        result = await original_request(self, method, url, **kwargs)
-        if 'mentions' in url:
-            captured_responses.append({
-                'url': url,
-                'status': getattr(result[1], 'status_code', 'unknown') if len(result) > 1 else 'N/A',
-                'data': result[0] if result else None
-            })
-        return result
+    # Only the first mentions response is inspected; later ones are just counted
+    captured = {'first': None, 'count': 0}
     
-    client_module.Client.request = patched_request
+    # httpx response hook on twikit's client: no need to patch Client.request
+    async def on_response(response):
+        if _is_target(response.url.raw_path):
+            captured['count'] += 1
+            if captured['first'] is not None:
+                return
+            raw = await response.aread()
+            try:
+                data = json.loads(raw) if raw else None
+            except ValueError:
+                data = None
+            captured['first'] = (str(response.url), response.status_code, data)
     
-    print("Intercepting twikit requests...\n")
+    print("Intercepting twikit requests...\n", flush=True)
     
     client = Client('en-US')
+    client.http.event_hooks['response'].append(on_response)
     client.load_cookies(BOT_COOKIES_PATH)
     
     result = await client.get_notifications('mentions')
     
     print(f"Result count: {len(result) if result else 0}")
     
-    if captured_responses:
-        print(f"\n📡 Captured {len(captured_responses)} responses:")
-        for i, resp in enumerate(captured_responses):
-            print(f"\n--- Response {i+1} ---")
-            print(f"URL: {resp['url'][:80]}...")
-            print(f"Status: {resp['status']}")
+    if captured['first']:
+        url, status, data = captured['first']
+        print(f"\n📡 Captured {captured['count']} responses, showing the first:")
+        print(f"URL: {url[:80]}...")
+        print(f"Status: {status}")
+        
+        if data:
+            # Save to file
+            _dump(data, 'captured_mentions.json')
+            print("✅ Saved to captured_mentions.json")
             
-            data = resp['data']
-            if data:
-                # Save to file
-                with open('captured_mentions.json', 'w') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                print("✅ Saved to captured_mentions.json")
+            # Analyze
+            if isinstance(data, dict):
+                print(f"Keys: {list(data.keys())}")
                 
-                # Analyze
-                if isinstance(data, dict):
-                    print(f"Keys: {list(data.keys())}")
+                # Check for globalObjects (common X response format)
+                if 'globalObjects' in data:
+                    go = data['globalObjects']
+                    tweets = go.get('tweets', {})
+                    users = go.get('users', {})
+                    print(f"Tweets: {len(tweets)}, Users: {len(users)}")
                     
-                    # Check for globalObjects (common X response format)
-                    if 'globalObjects' in data:
-                        go = data['globalObjects']
-                        tweets = go.get('tweets', {})
-                        users = go.get('users', {})
-                        print(f"Tweets: {len(tweets)}, Users: {len(users)}")
-                        
-                        if tweets:
-                            print("\n📝 First tweet:")
-                            tid, tweet = list(tweets.items())[0]
-                            print(f"  ID: {tid}")
-                            print(f"  Text: {tweet.get('full_text', 'N/A')[:100]}")
-                    
-                    # Check for empty data indicators
-                    if data.get('errors'):
-                        print(f"⚠️ Errors: {data['errors']}")
+                    if tweets:
+                        print("\n📝 First tweet:")
+                        tid, tweet = next(iter(tweets.items()))
+                        print(f"  ID: {tid}")
+                        print(f"  Text: {tweet.get('full_text', 'N/A')[:100]}")
+                
+                # Check for empty data indicators
+                if data.get('errors'):
+                    print(f"⚠️ Errors: {data['errors']}")
     else:
         print("❌ No responses captured")
 
 
 if __name__ == '__main__':
+    # Block-buffer stdout; progress lines flush explicitly before network waits
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(main())
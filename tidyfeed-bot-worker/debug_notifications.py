@@ -7,16 +7,35 @@ Run this to see what twikit returns.
 import os
 import sys
 import json
+import types
 import asyncio
+import inspect
+import functools
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+# Only pay for the dotenv import when there is a .env to read
+_ENV_FILE = Path(__file__).with_name('.env')
+if _ENV_FILE.is_file():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_ENV_FILE)
+    except ImportError:
+        pass
 
 BOT_COOKIES_PATH = os.environ.get('BOT_COOKIES_PATH', './cookies.json')
+TWEET_FIELDS = ('id', 'text', 'user', 'in_reply_to_status_id')
+
+_METHOD_TYPES = (types.FunctionType, types.MethodType, types.BuiltinFunctionType, classmethod, staticmethod)
+_getmembers_static = getattr(inspect, 'getmembers_static', inspect.getmembers)
+
+
+@functools.lru_cache(maxsize=None)
+def _class_fields(cls) -> tuple:
+    """Public non-method attribute names defined on cls, computed once per type."""
+    return tuple(
+        name for name, val in _getmembers_static(cls)
+        if not name.startswith('_') and not isinstance(val, _METHOD_TYPES)
+    )
 
 
 async def main():
@@ -39,14 +58,20 @@ async def main():
     
     print()
     print("Fetching notifications (mentions)...")
-    print("-" * 60)
+    print("-" * 60, flush=True)
     
     try:
-        # Try different notification types
-        for notif_type in ['mentions', 'All']:
+        # Try different notification types concurrently, then report in order
+        notif_types = ('mentions', 'All')
+        results = await asyncio.gather(
+            *(client.get_notifications(t) for t in notif_types),
+            return_exceptions=True
+        )
+        for notif_type, notifications in zip(notif_types, results):
             print(f"\n📬 Trying: get_notifications('{notif_type}')")
             try:
-                notifications = await client.get_notifications(notif_type)
+                if isinstance(notifications, Exception):
+                    raise notifications
                 print(f"   Type: {type(notifications)}")
                 print(f"   Count: {len(notifications) if notifications else 0}")
                 
@@ -56,34 +81,35 @@ async def main():
                         print(f"   Type: {type(notif).__name__}")
                         
                         # Print all attributes
-                        for attr in dir(notif):
-                            if not attr.startswith('_'):
-                                try:
-                                    val = getattr(notif, attr)
-                                    if not callable(val):
-                                        val_str = str(val)[:100] if val else 'None'
-                                        print(f"   {attr}: {val_str}")
-                                except:
-                                    pass
+                        attrs = sorted({*vars(notif), *_class_fields(type(notif))})
+                        for attr in attrs:
+                            if attr.startswith('_'):
+                                continue
+                            try:
+                                val = getattr(notif, attr)
+                            except Exception:
+                                continue
+                            val_str = str(val)[:100] if val else 'None'
+                            print(f"   {attr}: {val_str}")
                         
                         # Check for tweet
                         tweet = getattr(notif, 'tweet', None)
                         if tweet:
+                            tid, text, user, reply_to = (getattr(tweet, f, None) for f in TWEET_FIELDS)
                             print(f"\n   📝 Tweet found:")
-                            print(f"      ID: {getattr(tweet, 'id', 'N/A')}")
-                            print(f"      Text: {getattr(tweet, 'text', 'N/A')[:100]}")
-                            user = getattr(tweet, 'user', None)
+                            print(f"      ID: {tid or 'N/A'}")
+                            print(f"      Text: {(text or 'N/A')[:100]}")
                             if user:
                                 print(f"      User: @{getattr(user, 'screen_name', 'N/A')}")
-                            print(f"      Reply to: {getattr(tweet, 'in_reply_to_status_id', 'N/A')}")
+                            print(f"      Reply to: {reply_to or 'N/A'}")
                         
             except Exception as e:
-                print(f"   ❌ Error: {e}")
+                print(f"   ❌ Error: {e}", flush=True)
                 import traceback
                 traceback.print_exc()
                 
     except Exception as e:
-        print(f"❌ Fatal error: {e}")
+        print(f"❌ Fatal error: {e}", flush=True)
         import traceback
         traceback.print_exc()
     
@@ -93,4 +119,6 @@ async def main():
 
 
 if __name__ == '__main__':
+    # Block-buffer stdout; progress lines flush explicitly before network waits
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(main())
@@ -4,18 +4,18 @@ Debug: Watch what twikit actually returns from get_notifications
 """
 
 import os
+import sys
 import json
 import asyncio
+import operator
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
 BOT_COOKIES_PATH = './cookies.json'
 
+NOTIF_FIELDS = ('id', 'tweet', 'message', 'from_user', 'timestamp_ms', 'action')
+_get_fields = operator.attrgetter(*NOTIF_FIELDS)
+_MISSING = object()
+
 
 async def main():
     print("Debugging twikit get_notifications...\n")
@@ -25,7 +25,7 @@ async def main():
     client = Client('en-US')
     client.load_cookies(BOT_COOKIES_PATH)
     
-    print("Calling get_notifications('mentions')...")
+    print("Calling get_notifications('mentions')...", flush=True)
     
     try:
         result = await client.get_notifications('mentions')
@@ -42,9 +42,12 @@ async def main():
                 print(f"Type: {type(item).__name__}")
                 
                 # Print all attributes
-                for attr in ['id', 'tweet', 'message', 'from_user', 'timestamp_ms', 'action']:
-                    val = getattr(item, attr, 'N/A')
-                    if val != 'N/A':
+                try:
+                    vals = _get_fields(item)
+                except AttributeError:
+                    vals = tuple(getattr(item, attr, _MISSING) for attr in NOTIF_FIELDS)
+                for attr, val in zip(NOTIF_FIELDS, vals):
+                    if val is not _MISSING:
                         print(f"  {attr}: {str(val)[:100]}")
                 
                 if i >= 5:
@@ -57,13 +60,17 @@ async def main():
             print("\nTrying to get raw notifications...")
             
             # Check what methods are available
-            print(f"\nClient methods containing 'notif': {[m for m in dir(client) if 'notif' in m.lower()]}")
+            # Client's own namespace: no dir() MRO walk/sort over an instance
+            notif_methods = tuple(m for m in vars(Client) if 'notif' in m)
+            print(f"\nClient methods containing 'notif': {notif_methods}")
             
     except Exception as e:
-        print(f"Error: {e}")
+        print(f"Error: {e}", flush=True)
         import traceback
         traceback.print_exc()
 
 
 if __name__ == '__main__':
+    # Block-buffer stdout; progress lines flush explicitly before network waits
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(main())
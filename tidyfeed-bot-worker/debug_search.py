@@ -6,16 +6,34 @@ Debug script to test different methods of finding mentions.
 import os
 import sys
 import asyncio
+from itertools import islice
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
+# Only pay for the dotenv import when there is a .env to read
+_ENV_FILE = Path(__file__).with_name('.env')
+if _ENV_FILE.is_file():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_ENV_FILE)
+    except ImportError:
+        pass
 
 BOT_COOKIES_PATH = os.environ.get('BOT_COOKIES_PATH', './cookies.json')
 BOT_USERNAME = os.environ.get('BOT_USERNAME', 'tidyfeedapp')
+USER_ID_CACHE = Path('.bot_user_id')
+
+
+async def resolve_bot_user_id(client) -> str:
+    """Bot user ID, cached on disk as '<username> <id>' to skip the lookup on reruns."""
+    try:
+        username, user_id = USER_ID_CACHE.read_text().split()
+        if username == BOT_USERNAME:
+            return user_id
+    except (OSError, ValueError):
+        pass
+    user = await client.get_user_by_screen_name(BOT_USERNAME)
+    USER_ID_CACHE.write_text(f"{BOT_USERNAME} {user.id}")
+    return user.id
 
 
 async def main():
@@ -34,7 +52,16 @@ async def main():
     
     print(f"Loading cookies from {BOT_COOKIES_PATH}...")
     client.load_cookies(str(cookies_path))
-    print("✅ Cookies loaded\n")
+    print("✅ Cookies loaded\n", flush=True)
+    
+    search_query = f"@{BOT_USERNAME}"
+    
+    # Method 1's search and Method 2's user lookup are independent round-trips
+    results, user_id = await asyncio.gather(
+        client.search_tweet(search_query, 'Latest'),
+        resolve_bot_user_id(client),
+        return_exceptions=True
+    )
     
     # Method 1: Search for mentions
     print("=" * 60)
@@ -42,15 +69,15 @@ async def main():
     print("=" * 60)
     
     try:
-        search_query = f"@{BOT_USERNAME}"
         print(f"Searching: {search_query}")
         
-        results = await client.search_tweet(search_query, 'Latest')
+        if isinstance(results, Exception):
+            raise results
         print(f"Results type: {type(results)}")
         print(f"Results count: {len(results) if results else 0}")
         
         if results:
-            for i, tweet in enumerate(results[:5]):
+            for i, tweet in enumerate(islice(results, 5)):
                 print(f"\n--- Tweet {i+1} ---")
                 print(f"ID: {tweet.id}")
                 print(f"Text: {tweet.text[:150] if tweet.text else 'N/A'}")
@@ -58,7 +85,7 @@ async def main():
                 print(f"Reply to: {getattr(tweet, 'in_reply_to_status_id', 'N/A')}")
                 print(f"Created: {getattr(tweet, 'created_at', 'N/A')}")
     except Exception as e:
-        print(f"❌ Search error: {e}")
+        print(f"❌ Search error: {e}", flush=True)
         import traceback
         traceback.print_exc()
     
@@ -68,17 +95,17 @@ async def main():
     print("=" * 60)
     
     try:
-        # First get bot user info
-        user = await client.get_user_by_screen_name(BOT_USERNAME)
-        print(f"Bot user ID: {user.id}")
+        if isinstance(user_id, Exception):
+            raise user_id
+        print(f"Bot user ID: {user_id}", flush=True)
         
         # Try to get mentions
         # Note: This might need a different API call
-        mentions = await client.get_user_tweets(user.id, 'Replies')
+        mentions = await client.get_user_tweets(user_id, 'Replies')
         print(f"Replies count: {len(mentions) if mentions else 0}")
         
         if mentions:
-            for i, tweet in enumerate(mentions[:3]):
+            for i, tweet in enumerate(islice(mentions, 3)):
                 print(f"\n--- Reply {i+1} ---")
                 print(f"Text: {tweet.text[:100] if tweet.text else 'N/A'}")
     except Exception as e:
@@ -89,4 +116,6 @@ async def main():
 
 
 if __name__ == '__main__':
+    # Block-buffer stdout; progress lines flush explicitly before network waits
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(main())
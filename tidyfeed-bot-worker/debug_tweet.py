@@ -2,54 +2,48 @@
 """Debug: Capture and analyze TweetDetail response"""
 
 import os
+import sys
+import re
 import json
 import asyncio
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
 BOT_COOKIES_PATH = './cookies.json'
 TWEET_ID = '2006834169637384470'  # The target tweet
 
+# Matched against url.raw_path (bytes), so no per-response path decoding
+_is_target = re.compile(rb'TweetDetail').search
+
 async def main():
     print("Capturing TweetDetail response...\n")
     
     from twikit import Client
-    import twikit.client.client as client_module
     
     client = Client('en-US')
     client.load_cookies(BOT_COOKIES_PATH)
     
-    # Capture raw response
+    # Capture the raw response body via an httpx hook on twikit's client
     captured_data = {}
-    original_request = client_module.Client.request
     
-    async def patched_request(self_client, method, url, **kwargs):
-        result = await original_request(self_client, method, url, **kwargs)
-        if 'TweetDetail' in str(url):
-            captured_data['response'] = result[0] if result else None
-        return result
+    async def on_response(response):
+        if _is_target(response.url.raw_path):
+            captured_data['raw'] = await response.aread()
     
-    client_module.Client.request = patched_request
+    client.http.event_hooks['response'].append(on_response)
     
     try:
-        print(f"Fetching tweet {TWEET_ID}...")
+        print(f"Fetching tweet {TWEET_ID}...", flush=True)
         await client.get_tweet_by_id(TWEET_ID)
     except Exception as e:
         print(f"twikit error (expected): {e}")
-    finally:
-        client_module.Client.request = original_request
     
-    if 'response' in captured_data:
-        data = captured_data['response']
+    if captured_data.get('raw'):
+        raw = captured_data['raw']
+        data = json.loads(raw)
         
-        # Save full response
-        with open('tweet_detail_raw.json', 'w') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Save full response as received
+        with open('tweet_detail_raw.json', 'wb') as f:
+            f.write(raw)
         print("✅ Saved to tweet_detail_raw.json")
         
         # Analyze structure
@@ -86,4 +80,6 @@ async def main():
 
 
 if __name__ == '__main__':
+    # Block-buffer stdout; progress lines flush explicitly before network waits
+    sys.stdout.reconfigure(line_buffering=False)
     asyncio.run(main())
@@ -18,7 +18,6 @@ import os
 import sys
 import json
 import sqlite3
-import shutil
 from pathlib import Path
 
 # Configuration
@@ -28,67 +27,46 @@ OUTPUT_FILE = 'cookies.json'
 # Required cookies for X/Twitter authentication
 REQUIRED_COOKIES = ['auth_token', 'ct0']
 OPTIONAL_COOKIES = ['twid', 'tweetdeck_version', 'kdt']
+# guest_id cookies are kept if present (helps with requests)
+GUEST_COOKIES = ['guest_id', 'guest_id_ads', 'guest_id_marketing']
 
 
 def get_chrome_cookies(domain='x.com'):
     """Extract cookies from Chrome's database for a specific domain."""
     cookie_path = CHROME_COOKIE_PATH
 
-    if not cookie_path.exists():
+    # Chrome locks the database; immutable read-only mode skips locking without copying it.
+    # Read-only mode never creates the file, so a missing database fails right here.
+    try:
+        conn = sqlite3.connect(f'{cookie_path.as_uri()}?mode=ro&immutable=1', uri=True)
+    except sqlite3.OperationalError:
         print(f"❌ Chrome cookies not found at: {cookie_path}")
         print("\nMake sure Chrome is installed and you've logged into x.com")
         return None
 
-    # Chrome locks the database, so we need to copy it first
-    temp_path = Path('/tmp/chrome_cookies_copy.db')
-    try:
-        shutil.copy(cookie_path, temp_path)
-    except Exception as e:
-        print(f"❌ Cannot access Chrome cookies: {e}")
-        print("\nTry quitting Chrome first, then run this script again.")
-        return None
-
     cookies = {}
     try:
-        conn = sqlite3.connect(temp_path)
         conn.text_factory = bytes  # Handle encoded values
         cursor = conn.cursor()
 
-        # Query for cookies from x.com
-        cursor.execute("""
-            SELECT name, value, host_key
+        # Query only the cookies we need, from x.com and .x.com (not subdomains)
+        names = REQUIRED_COOKIES + OPTIONAL_COOKIES + GUEST_COOKIES
+        cursor.execute(f"""
+            SELECT name, value
             FROM cookies
-            WHERE host_key LIKE ? OR host_key LIKE ?
-        """, (f'%{domain}', f'%.{domain}'))
-
-        for row in cursor.fetchall():
-            name, value, host = row
-
-            # Decode value (Chrome stores as bytes)
-            try:
-                if isinstance(value, bytes):
-                    value = value.decode('utf-8')
-            except:
-                try:
-                    value = value.decode('utf-8', errors='ignore')
-                except:
-                    continue
-
-            # Only take cookies from x.com (not subdomains)
-            if host == domain or host == f'.{domain}':
-                cookies[name] = value
+            WHERE host_key IN (?, ?) AND name IN ({','.join('?' * len(names))})
+        """, (domain, f'.{domain}', *names))
+
+        # Cookie names/values are ASCII (RFC 6265); latin-1 decoding cannot fail
+        for name, value in cursor:
+            cookies[name.decode('latin-1')] = value.decode('latin-1')
 
         conn.close()
 
     except Exception as e:
         print(f"❌ Error reading cookie database: {e}")
+        print("\nTry quitting Chrome first, then run this script again.")
         return None
-    finally:
-        # Clean up temp file
-        try:
-            temp_path.unlink()
-        except:
-            pass
 
     return cookies
 
@@ -129,20 +107,9 @@ def main():
             print("   Make sure you're logged into x.com in Chrome")
             sys.exit(1)
 
-    # Filter to only needed cookies
-    output_cookies = {}
-    for name in REQUIRED_COOKIES + OPTIONAL_COOKIES:
-        if name in cookies:
-            output_cookies[name] = cookies[name]
-
-    # Add guest_id cookies if present (helps with requests)
-    for name in ['guest_id', 'guest_id_ads', 'guest_id_marketing']:
-        if name in cookies:
-            output_cookies[name] = cookies[name]
-
     # Save to file
     with open(OUTPUT_FILE, 'w') as f:
-        json.dump(output_cookies, f, indent=2)
+        json.dump(cookies, f, indent=2)
 
     print()
     print("=" * 60)
@@ -3,24 +3,27 @@
 TidyFeed Bot - Firefox Cookie Extractor (macOS)
 
 Extracts ALL X/Twitter cookies from Firefox for twikit.
+
+Usage:
+    python extract_cookies_firefox.py [--no-test]
 """
 
 import os
 import sys
 import json
+import asyncio
+import argparse
 import sqlite3
 from pathlib import Path
 
 # Configuration
 FIREFOX_BASE = Path.home() / 'Library/Application Support/Firefox/Profiles'
 OUTPUT_FILE = 'cookies.json'
+PROFILE_CACHE = Path.home() / '.cache/tidyfeed/firefox_profile.json'
 
 
-def find_firefox_profile():
-    """Find the default Firefox profile."""
-    if not FIREFOX_BASE.exists():
-        return None
-
+def _scan_firefox_profiles():
+    """Glob the Profiles directory for the default profile."""
     profiles = list(FIREFOX_BASE.glob('*.default*'))
     if not profiles:
         return None
@@ -33,6 +36,31 @@ def find_firefox_profile():
     return profiles[0]
 
 
+def find_firefox_profile():
+    """Find the default Firefox profile (cached until the Profiles directory changes)."""
+    try:
+        profiles_mtime = FIREFOX_BASE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    try:
+        cached = json.loads(PROFILE_CACHE.read_text())
+        if cached['profiles_mtime'] == profiles_mtime:
+            return Path(cached['path'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    profile = _scan_firefox_profiles()
+    if profile:
+        try:
+            PROFILE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+            PROFILE_CACHE.write_text(json.dumps({'profiles_mtime': profiles_mtime, 'path': str(profile)}))
+        except OSError:
+            pass  # Cache is best-effort
+
+    return profile
+
+
 def get_firefox_cookies(domain='x.com'):
     """Extract ALL cookies from Firefox for a specific domain."""
     profile = find_firefox_profile()
@@ -41,50 +69,36 @@ def get_firefox_cookies(domain='x.com'):
         return None
 
     cookie_path = profile / 'cookies.sqlite'
-    if not cookie_path.exists():
+
+    # Firefox may lock the database; immutable read-only mode skips locking without copying it.
+    # Read-only mode never creates the file, so a missing database fails right here.
+    try:
+        conn = sqlite3.connect(f'{cookie_path.as_uri()}?mode=ro&immutable=1', uri=True)
+    except sqlite3.OperationalError:
         print(f"❌ Firefox cookies not found at: {cookie_path}")
         return None
 
     print(f"📂 Firefox profile: {profile.name}")
 
-    # Copy database (Firefox may lock it)
-    import shutil
-    temp_path = Path('/tmp/firefox_cookies_copy.db')
-    try:
-        shutil.copy(cookie_path, temp_path)
-    except Exception as e:
-        print(f"❌ Cannot access Firefox cookies: {e}")
-        print("   Try quitting Firefox first")
-        return None
-
     cookies = {}
     try:
-        conn = sqlite3.connect(temp_path)
         cursor = conn.cursor()
 
-        # Query for ALL cookies from x.com (including .x.com)
+        # Query for ALL cookies from x.com and .x.com (exact host match can use the index)
         cursor.execute("""
-            SELECT name, value, host
+            SELECT name, value
             FROM moz_cookies
-            WHERE host LIKE ? OR host LIKE ?
-        """, (f'%{domain}', f'%.{domain}'))
+            WHERE host IN (?, ?)
+        """, (domain, f'.{domain}'))
 
-        for row in cursor.fetchall():
-            name, value, host = row
-            # Include all cookies from x.com and .x.com
-            cookies[name] = value
+        cookies = dict(cursor)
 
         conn.close()
 
     except Exception as e:
         print(f"❌ Error reading cookie database: {e}")
+        print("   Try quitting Firefox first")
         return None
-    finally:
-        # Clean up temp file
-        try:
-            temp_path.unlink()
-        except:
-            pass
 
     return cookies
 
@@ -97,17 +111,14 @@ async def test_cookies(cookies):
         client = Client('en-US')
         client.set_cookies(cookies)
 
-        # Try to get user_id (validates cookies)
-        uid = await client.user_id()
+        # user_id validates the cookies; user is fetched alongside it for display
+        uid, user = await asyncio.gather(client.user_id(), client.user(), return_exceptions=True)
+        if isinstance(uid, Exception):
+            raise uid
         if uid:
             print(f"✅ Authenticated! User ID: {uid}")
-
-            # Try to get username
-            try:
-                user = await client.user()
+            if not isinstance(user, Exception):
                 print(f"✅ Account: @{user.screen_name} ({user.name})")
-            except:
-                pass
             return True
         else:
             print("❌ Authentication failed - no user_id returned")
@@ -118,6 +129,11 @@ async def test_cookies(cookies):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Extract X/Twitter cookies from Firefox")
+    parser.add_argument('--no-test', action='store_true',
+                        help="skip the twikit authentication check before saving")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("🍪 TidyFeed Bot - Firefox Cookie Extractor")
     print("=" * 60)
@@ -146,8 +162,7 @@ def main():
         sys.exit(1)
 
     # Test cookies locally before saving
-    import asyncio
-    if not asyncio.run(test_cookies(cookies)):
+    if not args.no_test and not asyncio.run(test_cookies(cookies)):
         print("\n❌ Cookies failed authentication test!")
         print("\nPossible issues:")
         print("   - You're not logged into x.com as @tidyfeedapp")
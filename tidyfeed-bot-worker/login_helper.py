@@ -20,13 +20,16 @@ import os
 import sys
 import asyncio
 import json
+from pathlib import Path
 
-# Load environment variables
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    print("Warning: python-dotenv not installed, using environment variables directly")
+# Load environment variables (only pay for the dotenv import when there is a .env to read)
+_ENV_FILE = Path(__file__).with_name('.env')
+if _ENV_FILE.is_file():
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(_ENV_FILE)
+    except ImportError:
+        print("Warning: python-dotenv not installed, using environment variables directly")
 
 # Configuration
 BOT_USERNAME = os.environ.get('BOT_USERNAME', '')
@@ -130,4 +133,9 @@ async def main():
 
 
 if __name__ == '__main__':
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
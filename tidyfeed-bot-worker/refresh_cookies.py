@@ -19,26 +19,42 @@ import json
 import subprocess
 from pathlib import Path
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
 # Configuration
 FLY_APP_NAME = os.environ.get('FLY_APP_NAME', 'tidyfeed-bot-worker')
 REMOTE_PATH = '/data/cookies.json'
+ESSENTIAL_COOKIES = frozenset({'auth_token', 'ct0'})
+
+
+def _scan_fly_app_name(fly_toml: Path):
+    """Line-scan fly.toml for the app name (used when tomllib is unavailable)."""
+    with open(fly_toml) as f:
+        for line in f:
+            if 'app = ' in line or "app=" in line:
+                # Extract app name from line like: app = "tidyfeed-bot-worker"
+                name = line.split('=')[1].strip().strip('"').strip("'")
+                if name and not name.startswith('#'):
+                    return name
+    return None
 
 
 def get_fly_app_name():
     """Get the Fly app name from fly.toml or environment."""
+    fly_toml = Path('fly.toml')
     try:
-        fly_toml = Path('fly.toml')
-        if fly_toml.exists():
-            with open(fly_toml) as f:
-                for line in f:
-                    if 'app = ' in line or "app=" in line:
-                        # Extract app name from line like: app = "tidyfeed-bot-worker"
-                        name = line.split('=')[1].strip().strip('"').strip("'")
-                        if name and not name.startswith('#'):
-                            return name
+        if tomllib is not None:
+            try:
+                with open(fly_toml, 'rb') as f:
+                    return tomllib.load(f).get('app') or FLY_APP_NAME
+            except tomllib.TOMLDecodeError:
+                pass
+        return _scan_fly_app_name(fly_toml) or FLY_APP_NAME
     except Exception:
-        pass
-    return FLY_APP_NAME
+        return FLY_APP_NAME
 
 
 def verify_cookies(cookies_path: Path) -> bool:
@@ -50,28 +66,23 @@ def verify_cookies(cookies_path: Path) -> bool:
         # Support both formats: JSON array (EditThisCookie) or dict (key-value)
         if isinstance(cookies, dict):
             # Key-value format: {"auth_token": "...", "ct0": "..."}
-            cookie_names = set(cookies.keys())
-            essential = ['auth_token', 'ct0']
-            found = [e for e in essential if e in cookie_names]
-            if len(found) < 2:
-                print(f'⚠️ Warning: Missing essential cookies. Found: {found}')
-                print(f'   Expected: {essential}')
-            print(f'✅ Found {len(cookies)} cookies for x.com (key-value format)')
-            return True
+            cookie_names = cookies.keys()
+            fmt = 'key-value format'
         elif isinstance(cookies, list):
             # JSON array format: [{"name": "auth_token", "value": "..."}, ...]
             cookie_names = {c.get('name', '') for c in cookies}
-            essential = ['auth_token', 'ct0']
-            found = [e for e in essential if e in cookie_names]
-            if len(found) < 2:
-                print(f'⚠️ Warning: Missing essential cookies. Found: {found}')
-                print(f'   Expected: {essential}')
-            print(f'✅ Found {len(cookies)} cookies for x.com (JSON array format)')
-            return True
+            fmt = 'JSON array format'
         else:
             print('❌ Invalid format: cookies must be a JSON object or array')
             return False
 
+        missing = ESSENTIAL_COOKIES - cookie_names
+        if missing:
+            print(f'⚠️ Warning: Missing essential cookies. Found: {sorted(ESSENTIAL_COOKIES - missing)}')
+            print(f'   Expected: {sorted(ESSENTIAL_COOKIES)}')
+        print(f'✅ Found {len(cookies)} cookies for x.com ({fmt})')
+        return True
+
     except json.JSONDecodeError:
         print('❌ Invalid JSON format')
         return False
@@ -84,17 +95,13 @@ def upload_cookies(cookies_path: Path, app_name: str):
     """Upload cookies to Fly.io server."""
     print(f'\n🚀 Uploading cookies to Fly.io app: {app_name}')
 
-    # Method 1: Using pipe (most reliable)
     try:
-        with open(cookies_path, 'rb') as f:
-            cookies_data = f.read()
+        cookies_data = cookies_path.read_bytes()
 
-        # Use fly ssh with cat command
-        cmd = [
-            'fly', 'ssh', 'sftp', 'shell',
-            '-a', app_name,
-            f'cat > {REMOTE_PATH}'
-        ]
+        # One SSH session: stream the raw file over stdin and echo back its size,
+        # so there is no second `fly ssh` handshake just to verify
+        remote_cmd = f"sh -c 'cat > {REMOTE_PATH} && wc -c < {REMOTE_PATH}'"
+        cmd = ['fly', 'ssh', 'console', '-a', app_name, '-C', remote_cmd]
 
         result = subprocess.run(
             cmd,
@@ -106,11 +113,10 @@ def upload_cookies(cookies_path: Path, app_name: str):
             print('✅ Cookies uploaded successfully!')
 
             # Verify the upload
-            verify_cmd = ['fly', 'ssh', '-a', app_name, 'wc', '-c', REMOTE_PATH]
-            verify_result = subprocess.run(verify_cmd, capture_output=True, text=True)
-            if verify_result.returncode == 0:
-                size = verify_result.stdout.strip().split()[0]
-                print(f'   Uploaded file size: {size} bytes')
+            output = result.stdout.split()
+            if output:
+                size = output[-1].decode()
+                print(f'   Uploaded file size: {size} bytes (local: {len(cookies_data)})')
 
             print('\n📝 Next steps:')
             print('   1. Check bot logs: fly logs -a tidyfeed-bot-worker')
@@ -8,12 +8,6 @@ import json
 import asyncio
 import httpx
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass
-
 BOT_COOKIES_PATH = './cookies.json'
 X_BEARER = 'AAAAAAAAAAAAAAAAAAAAANRILgAAAAAAnNwIzUejRCOuH5E6I8xnZz4puTs=1Zv7ttfk8LF81IUq16cHjhLTvJu4FA33AGWWjCpTnA'
 
@@ -35,12 +29,25 @@ async def main():
     
     print("Testing X API endpoints...\n")
     
-    async with httpx.AsyncClient(headers=headers, timeout=30) as client:
+    limits = httpx.Limits(max_keepalive_connections=4)
+    async with httpx.AsyncClient(headers=headers, timeout=30, http2=True, limits=limits) as client:
+        
+        # The probes are independent: fire them together, then report in order
+        settings_r, activity_r, mentions_r, search_r = await asyncio.gather(
+            client.get('https://api.x.com/1.1/account/settings.json'),
+            client.get('https://api.x.com/1.1/activity/about_me.json', params={'count': 20}),
+            client.get('https://api.x.com/1.1/statuses/mentions_timeline.json', params={'count': 20}),
+            client.get('https://api.x.com/1.1/search/tweets.json',
+                       params={'q': '@tidyfeedapp', 'result_type': 'recent', 'count': 10}),
+            return_exceptions=True
+        )
         
         # Test 1: Account settings (known to work)
         print("1️⃣ Testing account/settings.json")
         try:
-            r = await client.get('https://api.x.com/1.1/account/settings.json')
+            r = settings_r
+            if isinstance(r, Exception):
+                raise r
             print(f"   Status: {r.status_code}")
             if r.status_code == 200:
                 data = r.json()
@@ -51,7 +58,9 @@ async def main():
         # Test 2: Activity (notifications)
         print("\n2️⃣ Testing activity/about_me.json")
         try:
-            r = await client.get('https://api.x.com/1.1/activity/about_me.json', params={'count': 20})
+            r = activity_r
+            if isinstance(r, Exception):
+                raise r
             print(f"   Status: {r.status_code}")
             if r.status_code == 200:
                 data = r.json()
@@ -65,7 +74,9 @@ async def main():
         # Test 3: Mentions timeline
         print("\n3️⃣ Testing statuses/mentions_timeline.json")
         try:
-            r = await client.get('https://api.x.com/1.1/statuses/mentions_timeline.json', params={'count': 20})
+            r = mentions_r
+            if isinstance(r, Exception):
+                raise r
             print(f"   Status: {r.status_code}")
             if r.status_code == 200:
                 data = r.json()
@@ -82,8 +93,9 @@ async def main():
         # Test 4: Search tweets
         print("\n4️⃣ Testing search/tweets.json")
         try:
-            r = await client.get('https://api.x.com/1.1/search/tweets.json', 
-                                params={'q': '@tidyfeedapp', 'result_type': 'recent', 'count': 10})
+            r = search_r
+            if isinstance(r, Exception):
+                raise r
             print(f"   Status: {r.status_code}")
             if r.status_code == 200:
                 data = r.json()
@@ -94,4 +106,9 @@ async def main():
 
 
 if __name__ == '__main__':
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
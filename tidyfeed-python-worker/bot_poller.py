@@ -9,13 +9,25 @@ Uses twikit for async Twitter API access.
 """
 
 import os
+import re
 import sys
 import json
+import pickle
+import random
+import threading
 import asyncio
 import logging
+from collections import deque
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+import httpx
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 # Load .env file for local development
 try:
     from dotenv import load_dotenv
@@ -44,56 +56,113 @@ BOT_EMAIL = os.environ.get('BOT_EMAIL', '')
 BOT_PASSWORD = os.environ.get('BOT_PASSWORD', '')
 BOT_COOKIES_JSON = os.environ.get('BOT_COOKIES_JSON', '')
 
+
+def _parse_cookies_json(raw: str) -> Optional[Dict[str, Any]]:
+    """Parse BOT_COOKIES_JSON once at startup; None if unset or malformed."""
+    if not raw:
+        return None
+    try:
+        return json_loads(raw)
+    except ValueError as e:
+        logger.warning(f'BOT_COOKIES_JSON is not valid JSON: {e}')
+        return None
+
+
+BOT_COOKIES = _parse_cookies_json(BOT_COOKIES_JSON)
+
 # Polling settings
 POLL_INTERVAL_SECONDS = int(os.environ.get('BOT_POLL_INTERVAL', '60'))
+MAX_IDLE_BACKOFF = 8           # Idle polls stretch the interval up to 8x
+_MAX_IDLE_DOUBLINGS = MAX_IDLE_BACKOFF.bit_length() - 1   # log2(MAX_IDLE_BACKOFF)
+AUTH_RETRY_SECONDS = 30        # Base delay after an auth failure, doubled per failure
+MAX_AUTH_RETRY_SECONDS = 600
+_MAX_AUTH_DOUBLINGS = (MAX_AUTH_RETRY_SECONDS // AUTH_RETRY_SECONDS).bit_length()
+
+# Save commands are queued and sent to the backend by a small worker pool
+SAVE_QUEUE_SIZE = 100
+SAVE_WORKERS = 4
+SAVE_DRAIN_TIMEOUT = 30        # Seconds to flush queued saves on shutdown
 
 # File paths
 COOKIES_FILE = Path('/tmp/twikit_cookies.json')
-STATE_FILE = Path('/tmp/bot_state.json')
+STATE_FILE = Path('/tmp/bot_state.pickle')
+LEGACY_STATE_FILE = Path('/tmp/bot_state.json')  # Pre-pickle format, migrated on load
+
+# Most recent processed notification IDs remembered for deduplication
+MAX_PROCESSED_IDS = 1000
 
 # Trigger words that activate the save command
 TRIGGER_WORDS = ['save', 'keep', '收藏', '保存', 'bookmark']
+# One case-insensitive pass over the text instead of lower() + a scan per word
+_TRIGGER_RE = re.compile('|'.join(map(re.escape, TRIGGER_WORDS)), re.IGNORECASE)
 
 
 # ============================================
 # State Management
 # ============================================
 
+def _new_state(processed_ids: List[str], last_processed_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build in-memory state: a bounded deque keeps FIFO order for eviction,
+    a mirror set gives O(1) membership checks.
+    """
+    ids = deque(processed_ids, maxlen=MAX_PROCESSED_IDS)
+    return {
+        'processed_ids': ids,
+        'processed_set': set(ids),
+        'last_processed_id': last_processed_id,
+        'dirty': False,
+    }
+
+
 def load_state() -> Dict[str, Any]:
-    """Load bot state from file."""
-    if STATE_FILE.exists():
-        try:
-            with open(STATE_FILE, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f'Failed to load state: {e}')
-    return {'processed_ids': [], 'last_processed_id': None}
+    """Load bot state from file, migrating the legacy JSON state if present."""
+    try:
+        if STATE_FILE.exists():
+            data = pickle.loads(STATE_FILE.read_bytes())
+            return _new_state(data['processed_ids'], data['last_processed_id'])
+        if LEGACY_STATE_FILE.exists():
+            data = json_loads(LEGACY_STATE_FILE.read_bytes())
+            state = _new_state(data.get('processed_ids', []), data.get('last_processed_id'))
+            state['dirty'] = True  # Rewrite in the new format on the next save
+            return state
+    except Exception as e:
+        logger.warning(f'Failed to load state: {e}')
+    return _new_state([])
 
 
 def save_state(state: Dict[str, Any]):
-    """Save bot state to file."""
+    """Save bot state to file via temp file + rename, so a crash can't tear it."""
     try:
-        # Keep only last 1000 processed IDs to prevent unbounded growth
-        if len(state.get('processed_ids', [])) > 1000:
-            state['processed_ids'] = state['processed_ids'][-500:]
-        
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f)
+        tmp_path = STATE_FILE.with_suffix('.tmp')
+        tmp_path.write_bytes(pickle.dumps({
+            'processed_ids': list(state['processed_ids']),
+            'last_processed_id': state['last_processed_id'],
+        }, protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, STATE_FILE)
+        LEGACY_STATE_FILE.unlink(missing_ok=True)
+        state['dirty'] = False
     except Exception as e:
         logger.warning(f'Failed to save state: {e}')
 
 
 def is_processed(state: Dict[str, Any], notification_id: str) -> bool:
     """Check if a notification has already been processed."""
-    return notification_id in state.get('processed_ids', [])
+    return notification_id in state['processed_set']
 
 
 def mark_processed(state: Dict[str, Any], notification_id: str):
     """Mark a notification as processed."""
-    if 'processed_ids' not in state:
-        state['processed_ids'] = []
-    state['processed_ids'].append(notification_id)
+    ids, seen = state['processed_ids'], state['processed_set']
+    if notification_id in seen:
+        return
+    if len(ids) == ids.maxlen:
+        # The deque is about to evict its oldest entry; drop it from the set too
+        seen.discard(ids[0])
+    ids.append(notification_id)
+    seen.add(notification_id)
     state['last_processed_id'] = notification_id
+    state['dirty'] = True
 
 
 # ============================================
@@ -102,8 +171,26 @@ def mark_processed(state: Dict[str, Any], notification_id: str):
 
 def contains_trigger_word(text: str) -> bool:
     """Check if text contains any trigger word."""
-    text_lower = text.lower()
-    return any(trigger in text_lower for trigger in TRIGGER_WORDS)
+    return _TRIGGER_RE.search(text) is not None
+
+
+_MISSING = object()
+
+# Attribute names to try, in order, across twikit versions / object types
+_TWEET_ATTRS = ('tweet', 'target_tweet', 'status')
+_TEXT_ATTRS = ('text', 'full_text')
+_HANDLE_ATTRS = ('screen_name', 'username')
+_USER_ID_ATTRS = ('id', 'rest_id')
+_REPLY_ATTRS = ('in_reply_to_status_id', 'in_reply_to_tweet_id', 'in_reply_to')
+
+
+def _first_attr(obj, names, default=None):
+    """Return the first truthy attribute of obj among names, else default."""
+    for name in names:
+        value = getattr(obj, name, _MISSING)
+        if value is not _MISSING and value:
+            return value
+    return default
 
 
 def extract_command_payload(notification, tweet) -> Optional[Dict[str, Any]]:
@@ -127,8 +214,8 @@ def extract_command_payload(notification, tweet) -> Optional[Dict[str, Any]]:
             logger.debug('No user found in tweet')
             return None
         
-        commander_handle = getattr(commander, 'screen_name', None) or getattr(commander, 'username', None)
-        commander_id = getattr(commander, 'id', None) or getattr(commander, 'rest_id', None)
+        commander_handle = _first_attr(commander, _HANDLE_ATTRS)
+        commander_id = _first_attr(commander, _USER_ID_ATTRS)
         
         if not commander_handle or not commander_id:
             logger.debug('Could not extract commander info')
@@ -136,9 +223,11 @@ def extract_command_payload(notification, tweet) -> Optional[Dict[str, Any]]:
         
         # The tweet being replied to (the target to save)
         # This is the tweet the commander is replying to while mentioning us
-        in_reply_to_id = getattr(tweet, 'in_reply_to_status_id', None) or \
-                         getattr(tweet, 'in_reply_to_tweet_id', None) or \
-                         getattr(tweet, 'reply_to', [None])[0] if hasattr(tweet, 'reply_to') else None
+        in_reply_to_id = _first_attr(tweet, _REPLY_ATTRS)
+        if not in_reply_to_id:
+            reply_to = getattr(tweet, 'reply_to', None)
+            if reply_to:
+                in_reply_to_id = getattr(reply_to[0], 'id', reply_to[0])
         
         if not in_reply_to_id:
             # Direct mention, not a reply - skip for now
@@ -156,7 +245,7 @@ def extract_command_payload(notification, tweet) -> Optional[Dict[str, Any]]:
             'target_tweet_id': target_tweet_id,
             'target_url': f'https://x.com/i/status/{target_tweet_id}',
             'notification_id': getattr(notification, 'id', str(tweet.id)),
-            'command_text': getattr(tweet, 'text', '') or getattr(tweet, 'full_text', '')
+            'command_text': _first_attr(tweet, _TEXT_ATTRS, '')
         }
         
     except Exception as e:
@@ -164,30 +253,42 @@ def extract_command_payload(notification, tweet) -> Optional[Dict[str, Any]]:
         return None
 
 
-async def handle_save_command(payload: Dict[str, Any]) -> bool:
+def create_backend_client() -> httpx.AsyncClient:
+    """Shared keep-alive HTTP/2 client for all backend calls."""
+    return httpx.AsyncClient(
+        base_url=API_BASE_URL,
+        headers={'X-Service-Key': INTERNAL_SERVICE_KEY},
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4)
+    )
+
+
+async def handle_save_command(http: httpx.AsyncClient, payload: Dict[str, Any]) -> bool:
     """
     Handle a save command by calling the backend API.
     
-    This function will be expanded to actually save the tweet.
-    For now, it just logs the payload.
+    Returns True if the backend accepted the save.
     """
     logger.info(f"📥 Save command received:")
     logger.info(f"   Commander: @{payload['commander_handle']} (ID: {payload['commander_id']})")
     logger.info(f"   Target: {payload['target_url']}")
     logger.info(f"   Command: {payload['command_text'][:50]}...")
     
-    # TODO: Implement backend API call
-    # This will be implemented in the next step
-    # 
-    # import requests
-    # response = requests.post(
-    #     f'{API_BASE_URL}/api/bot/save-thread',
-    #     headers={'X-Service-Key': INTERNAL_SERVICE_KEY},
-    #     json=payload
-    # )
-    # return response.ok
-    
-    return True
+    # Same request bot.py sends; the backend dedupes on mention_id
+    body = {
+        'handle': payload['commander_handle'],
+        'tweet_url': payload['target_url'],
+        'mention_id': payload['notification_id'],
+    }
+    try:
+        response = await http.post('/api/internal/bot-save', json=body)
+        if not response.is_success:
+            logger.error(f'Backend error: {response.status_code} - {response.text[:200]}')
+        return response.is_success
+    except httpx.HTTPError as e:
+        logger.error(f'Backend request failed: {e}')
+        return False
 
 
 # ============================================
@@ -201,12 +302,50 @@ class TidyFeedBot:
         self.client = None
         self._initialized = False
         self.state = load_state()
+        self.http = create_backend_client()
+        self.save_queue: Optional[asyncio.Queue] = None
+        self._save_workers: List[asyncio.Task] = []
+    
+    async def aclose(self):
+        """Flush queued saves, stop the save workers and close the backend HTTP client."""
+        # Queued notifications are already marked processed, so dropping them would lose the commands
+        if self.save_queue is not None and self._save_workers:
+            try:
+                await asyncio.wait_for(self.save_queue.join(), SAVE_DRAIN_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.error(f'❌ Shutting down with {self.save_queue.qsize()} save command(s) still queued')
+        
+        for task in self._save_workers:
+            task.cancel()
+        await asyncio.gather(*self._save_workers, return_exceptions=True)
+        self._save_workers = []
+        await self.http.aclose()
+    
+    def _start_save_workers(self):
+        """Start the save worker pool once; needs a running event loop."""
+        if self._save_workers:
+            return
+        self.save_queue = asyncio.Queue(maxsize=SAVE_QUEUE_SIZE)
+        self._save_workers = [asyncio.create_task(self._save_worker()) for _ in range(SAVE_WORKERS)]
+    
+    async def _save_worker(self):
+        """Send queued save commands to the backend, one at a time per worker."""
+        while True:
+            payload = await self.save_queue.get()
+            try:
+                await handle_save_command(self.http, payload)
+            except Exception as e:
+                logger.error(f'Error handling save command: {e}')
+            finally:
+                self.save_queue.task_done()
     
     async def initialize(self) -> bool:
         """Initialize the twikit client and authenticate."""
         if self._initialized:
             return True
         
+        self._start_save_workers()
+        
         try:
             from twikit import Client
             
@@ -239,19 +378,16 @@ class TidyFeedBot:
             return True
             
         except Exception as e:
-            logger.error(f'❌ Failed to initialize bot: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.error(f'❌ Failed to initialize bot: {e}', exc_info=logger.isEnabledFor(logging.DEBUG))
             return False
     
     async def _load_cookies(self) -> bool:
         """Load and validate cookies from env or file."""
         try:
             # Priority 1: Environment variable (for container deployments)
-            if BOT_COOKIES_JSON:
+            if BOT_COOKIES:
                 logger.debug('Trying cookies from BOT_COOKIES_JSON...')
-                cookies = json.loads(BOT_COOKIES_JSON)
-                self.client.set_cookies(cookies)
+                self.client.set_cookies(BOT_COOKIES)
                 
                 # Verify cookies work by making a simple API call
                 user = await self.client.user()
@@ -282,12 +418,12 @@ class TidyFeedBot:
         except Exception as e:
             logger.warning(f'Failed to save cookies: {e}')
     
-    async def poll_notifications(self):
-        """Poll for new notifications and process save commands."""
+    async def poll_notifications(self) -> int:
+        """Poll for new notifications and queue save commands. Returns the number queued."""
         if not self._initialized:
             if not await self.initialize():
                 logger.warning('Skipping poll - bot not initialized')
-                return
+                return 0
         
         try:
             logger.debug('🔍 Checking notifications...')
@@ -298,7 +434,7 @@ class TidyFeedBot:
             
             if not notifications:
                 logger.debug('No notifications')
-                return
+                return 0
             
             processed_count = 0
             
@@ -307,37 +443,35 @@ class TidyFeedBot:
                 if result:
                     processed_count += 1
             
-            # Save state after processing
-            save_state(self.state)
+            # Save state only if processing changed it
+            if self.state['dirty']:
+                save_state(self.state)
             
             if processed_count > 0:
-                logger.info(f'✅ Processed {processed_count} new command(s)')
+                logger.info(f'✅ Queued {processed_count} new command(s)')
+            
+            return processed_count
                 
         except Exception as e:
-            logger.error(f'❌ Error polling notifications: {e}')
-            import traceback
-            traceback.print_exc()
+            logger.error(f'❌ Error polling notifications: {e}', exc_info=logger.isEnabledFor(logging.DEBUG))
             
             # Reset on auth errors
             if 'Unauthorized' in str(e) or '401' in str(e) or 'Could not authenticate' in str(e):
                 logger.warning('Auth error detected, will re-authenticate on next poll')
                 self._initialized = False
+            return 0
     
     async def _process_notification(self, notification) -> bool:
         """
         Process a single notification.
-        Returns True if a command was processed.
+        Returns True if a save command was queued.
         """
         try:
             # Get notification ID for deduplication
             notification_id = str(getattr(notification, 'id', ''))
             
             # Extract tweet from notification
-            tweet = getattr(notification, 'tweet', None)
-            if not tweet:
-                # Try alternative attribute names
-                tweet = getattr(notification, 'target_tweet', None) or \
-                        getattr(notification, 'status', None)
+            tweet = _first_attr(notification, _TWEET_ATTRS)
             
             if not tweet:
                 return False
@@ -354,7 +488,7 @@ class TidyFeedBot:
                 return False
             
             # Get tweet text
-            text = getattr(tweet, 'text', '') or getattr(tweet, 'full_text', '')
+            text = _first_attr(tweet, _TEXT_ATTRS, '')
             
             # Check for trigger words
             if not contains_trigger_word(text):
@@ -369,17 +503,21 @@ class TidyFeedBot:
                 mark_processed(self.state, notification_id)
                 return False
             
-            # Handle the save command
-            success = await handle_save_command(payload)
-            
-            # Mark as processed regardless of success
-            # (to avoid repeated processing of failed commands)
+            # Mark as processed now, regardless of the eventual save result
+            # (dedup covers in-flight commands; failed ones are not retried)
             mark_processed(self.state, notification_id)
             
-            return success
+            # Hand the save off to the workers so polling never waits on the backend
+            try:
+                self.save_queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                logger.warning(f'Save queue full, dropping command {notification_id}')
+                return False
+            
+            return True
             
         except Exception as e:
-            logger.error(f'Error processing notification: {e}')
+            logger.error(f'Error processing notification: {e}', exc_info=logger.isEnabledFor(logging.DEBUG))
             return False
 
 
@@ -387,12 +525,27 @@ class TidyFeedBot:
 # Main Loop
 # ============================================
 
-async def run_bot_loop():
-    """Main bot polling loop."""
+def next_poll_delay(empty_streak: int, auth_failures: int) -> float:
+    """
+    Seconds to wait before the next poll.
+    
+    Doubles per consecutive idle poll (up to MAX_IDLE_BACKOFF x the base
+    interval) plus up to 10% jitter; after auth failures, backs off
+    exponentially from AUTH_RETRY_SECONDS so re-auth attempts don't hammer X.
+    """
+    if auth_failures:
+        return min(AUTH_RETRY_SECONDS * 2 ** min(auth_failures, _MAX_AUTH_DOUBLINGS), MAX_AUTH_RETRY_SECONDS)
+    # Clamp the exponent, not the result: the streak grows forever on an idle account
+    delay = POLL_INTERVAL_SECONDS * 2 ** min(empty_streak, _MAX_IDLE_DOUBLINGS)
+    return delay + random.uniform(0, POLL_INTERVAL_SECONDS * 0.1)
+
+
+async def run_bot_loop(stop: threading.Event = None):
+    """Main bot polling loop. Runs until `stop` is set (forever when run standalone)."""
     logger.info('=' * 50)
     logger.info('🤖 TidyFeed Twitter Bot Poller')
     logger.info(f'   API: {API_BASE_URL}')
-    logger.info(f'   Poll interval: {POLL_INTERVAL_SECONDS}s')
+    logger.info(f'   Poll interval: {POLL_INTERVAL_SECONDS}s (up to {POLL_INTERVAL_SECONDS * MAX_IDLE_BACKOFF}s when idle)')
     logger.info(f'   Triggers: {TRIGGER_WORDS}')
     logger.info('=' * 50)
     
@@ -402,26 +555,48 @@ async def run_bot_loop():
     
     bot = TidyFeedBot()
     
-    # Initial authentication
-    if not await bot.initialize():
-        logger.error('❌ Failed to initialize bot, exiting')
-        return
-    
-    logger.info('🚀 Bot started, polling for mentions...')
-    
-    while True:
-        try:
-            await bot.poll_notifications()
-        except Exception as e:
-            logger.error(f'❌ Bot loop error: {e}')
+    try:
+        # Initial authentication
+        if not await bot.initialize():
+            logger.error('❌ Failed to initialize bot, exiting')
+            return
+        
+        logger.info('🚀 Bot started, polling for mentions...')
         
-        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        empty_streak = 0
+        auth_failures = 0
+        
+        while not (stop and stop.is_set()):
+            processed = 0
+            try:
+                processed = await bot.poll_notifications()
+            except Exception as e:
+                logger.error(f'❌ Bot loop error: {e}')
+            
+            # A poll that left the bot uninitialized hit an auth problem
+            auth_failures = 0 if bot._initialized else auth_failures + 1
+            empty_streak = 0 if processed else empty_streak + 1
+            
+            delay = next_poll_delay(empty_streak, auth_failures)
+            if stop:
+                # Sleep on the event so a shutdown request wakes the loop immediately
+                await asyncio.to_thread(stop.wait, delay)
+            else:
+                await asyncio.sleep(delay)
+    finally:
+        await bot.aclose()
 
 
-def start_bot():
+def start_bot(stop: threading.Event = None):
     """Entry point to start the bot in an async loop."""
     try:
-        asyncio.run(run_bot_loop())
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    try:
+        asyncio.run(run_bot_loop(stop))
     except KeyboardInterrupt:
         logger.info('Bot stopped by user')
 
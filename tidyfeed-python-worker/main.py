@@ -1,18 +1,21 @@
 """
 TidyFeed Worker - Unified Entry Point
 
-Runs multiple worker processes in parallel:
+Runs multiple workers in parallel threads of one process:
 1. Video Downloader (worker.py) - Syncs polling loop
 2. Twitter Bot Poller (bot_poller.py) - Async polling loop
 
+Both are I/O-bound, so they share one interpreter instead of a process each.
+
 Use this as the main entry point for container deployments.
 """
 
 import os
 import sys
+import time
+import signal
 import logging
-import multiprocessing
-from concurrent.futures import ProcessPoolExecutor
+import threading
 
 # Load .env file for local development
 try:
@@ -24,24 +27,35 @@ except ImportError:
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] [Main] %(message)s',
+    format='%(asctime)s [%(levelname)s] [%(threadName)s] %(message)s',
     handlers=[logging.StreamHandler(sys.stdout)]
 )
 logger = logging.getLogger(__name__)
 
+# Set on shutdown; both worker loops check it between polls
+stop_event = threading.Event()
+
 
 def run_video_worker():
     """Run the video downloader worker."""
     from worker import main as video_worker_main
     logger.info('Starting Video Downloader Worker...')
-    video_worker_main()
+    video_worker_main(stop_event)
 
 
 def run_bot_poller():
     """Run the Twitter bot poller."""
     from bot_poller import start_bot
     logger.info('Starting Twitter Bot Poller...')
-    start_bot()
+    start_bot(stop_event)
+
+
+def handle_signal(signum, frame):
+    """First SIGTERM/SIGINT stops the workers gracefully; a second one exits immediately."""
+    if stop_event.is_set():
+        os._exit(128 + signum)
+    logger.info(f'Received {signal.Signals(signum).name}, shutting down workers (send again to force exit)...')
+    stop_event.set()
 
 
 def main():
@@ -54,34 +68,31 @@ def main():
     enable_video_worker = True  # Always enabled
     enable_bot_poller = bool(os.environ.get('BOT_USERNAME'))
     
-    processes = []
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+    
+    threads = []
     
-    # Start Video Worker process
+    # Start Video Worker thread
     if enable_video_worker:
-        video_process = multiprocessing.Process(target=run_video_worker, name='VideoWorker')
-        video_process.start()
-        processes.append(video_process)
-        logger.info('Video Downloader Worker started (PID: %d)', video_process.pid)
+        video_thread = threading.Thread(target=run_video_worker, name='VideoWorker', daemon=True)
+        video_thread.start()
+        threads.append(video_thread)
+        logger.info('Video Downloader Worker started')
     
-    # Start Bot Poller process (only if configured)
+    # Start Bot Poller thread (only if configured)
     if enable_bot_poller:
-        bot_process = multiprocessing.Process(target=run_bot_poller, name='BotPoller')
-        bot_process.start()
-        processes.append(bot_process)
-        logger.info('Twitter Bot Poller started (PID: %d)', bot_process.pid)
+        bot_thread = threading.Thread(target=run_bot_poller, name='BotPoller', daemon=True)
+        bot_thread.start()
+        threads.append(bot_thread)
+        logger.info('Twitter Bot Poller started')
     else:
         logger.info('Twitter Bot Poller disabled (BOT_USERNAME not set)')
     
-    # Wait for all processes
-    try:
-        for p in processes:
-            p.join()
-    except KeyboardInterrupt:
-        logger.info('Shutting down workers...')
-        for p in processes:
-            p.terminate()
-            p.join(timeout=5)
-        logger.info('All workers stopped')
+    # Wait for all workers; after a stop signal they drain in-flight work and return
+    while any(t.is_alive() for t in threads):
+        time.sleep(1)
+    logger.info('All workers stopped')
 
 
 if __name__ == '__main__':
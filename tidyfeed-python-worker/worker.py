@@ -12,11 +12,23 @@ then wiped from the database upon task completion.
 import os
 import sys
 import time
+import random
+import shutil
+import signal
 import tempfile
-import subprocess
+import threading
 import logging
+import boto3
 import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from yt_dlp import YoutubeDL
+from yt_dlp.utils import DownloadCancelled, DownloadError
 
 # Load .env file for local development
 try:
@@ -37,6 +49,21 @@ logger = logging.getLogger(__name__)
 API_BASE_URL = os.environ.get('API_BASE_URL', 'https://api.tidyfeed.app')
 INTERNAL_SERVICE_KEY = os.environ.get('INTERNAL_SERVICE_KEY', '')
 POLL_INTERVAL = int(os.environ.get('POLL_INTERVAL', '5'))
+MAX_POLL_INTERVAL = int(os.environ.get('MAX_POLL_INTERVAL', '60'))
+# Seconds the backend may hold /next-task open waiting for work (0 disables long-polling)
+LONG_POLL_WAIT = int(os.environ.get('LONG_POLL_WAIT', '25'))
+# Tasks processed at once (downloads and uploads are network-bound)
+DOWNLOAD_CONCURRENCY = max(1, int(os.environ.get('DOWNLOAD_CONCURRENCY', '3')))
+# Uploads run on their own threads so the next download can start meanwhile
+UPLOAD_CONCURRENCY = max(1, int(os.environ.get('UPLOAD_CONCURRENCY', '2')))
+# Opt-in RAM-backed dir (e.g. /dev/shm) for per-task downloads; unset means the default temp dir.
+# tmpfs counts against the VM's memory, so only point this at a tmpfs sized for the workload.
+# In practice also set WORKER_TMP_MIN_FREE_MB: the derived worst-case default is
+# 2 x MAX_VIDEO_BYTES for every download slot and queued upload (~14GB with stock
+# settings), which no ordinary tmpfs has, so WORKER_TMP_ROOT alone would never be used.
+WORKER_TMP_ROOT = os.environ.get('WORKER_TMP_ROOT', '')
+# Free space required before a task uses WORKER_TMP_ROOT (0 = derive it from MAX_VIDEO_BYTES)
+WORKER_TMP_MIN_FREE = int(os.environ.get('WORKER_TMP_MIN_FREE_MB', '0')) * 1024 * 1024
 
 # R2 configuration (S3-compatible)
 R2_ACCOUNT_ID = os.environ.get('R2_ACCOUNT_ID', '')
@@ -54,34 +81,111 @@ HEADERS = {
 }
 
 
+def _new_api_session() -> requests.Session:
+    """
+    One keep-alive session for all internal API calls (no TLS handshake per poll).
+    Retries cover transient gateway errors on idempotent requests.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount('https://', HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=DOWNLOAD_CONCURRENCY + UPLOAD_CONCURRENCY + 1,  # one per thread plus the poller
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+    ))
+    return session
+
+
+def _new_r2_session() -> requests.Session:
+    """Presigned R2 PUTs go through their own session: the service key must not leave our API."""
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_maxsize=UPLOAD_CONCURRENCY))
+    return session
+
+
+SESSION = _new_api_session()
+R2_SESSION = _new_r2_session()
+
+UPLOAD_POOL = ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY, thread_name_prefix='uploader')
+# Backpressure: at most this many downloaded files wait on disk for an uploader
+UPLOAD_SLOTS = threading.BoundedSemaphore(UPLOAD_CONCURRENCY * 2)
+
+# Consecutive failed internal API calls; while non-zero the poll loop backs off hard
+_api_failures = 0
+MAX_FAILURE_INTERVAL = 300
+
+
+def _api_ok():
+    global _api_failures
+    _api_failures = 0
+
+
+def _api_failed():
+    global _api_failures
+    _api_failures += 1
+
+
 def get_next_task():
     """Poll for the next pending download task."""
     try:
-        response = requests.get(
+        response = SESSION.get(
             f'{API_BASE_URL}/api/downloads/internal/next-task',
-            headers=HEADERS,
-            timeout=30
+            params={'wait': LONG_POLL_WAIT} if LONG_POLL_WAIT else None,
+            timeout=(10, LONG_POLL_WAIT + 30)
         )
         response.raise_for_status()
+        _api_ok()
         data = response.json()
         return data.get('task')
     except requests.RequestException as e:
+        _api_failed()
         logger.error(f'Failed to get next task: {e}')
         return None
 
 
+# Flipped off the first time the backend 404s the batch endpoint
+_batch_claim_supported = True
+
+
+def get_next_tasks(limit: int) -> list:
+    """Claim up to `limit` pending tasks in one call (falls back to get_next_task on older backends)."""
+    global _batch_claim_supported
+    if limit <= 1 or not _batch_claim_supported:
+        task = get_next_task()
+        return [task] if task else []
+    
+    try:
+        response = SESSION.post(
+            f'{API_BASE_URL}/api/downloads/internal/next-tasks',
+            json={'limit': limit, 'wait': LONG_POLL_WAIT},
+            timeout=(10, LONG_POLL_WAIT + 30)
+        )
+        if response.status_code == 404:
+            logger.info('Backend has no batch claim endpoint, polling one task at a time')
+            _batch_claim_supported = False
+            return get_next_tasks(limit)
+        response.raise_for_status()
+        _api_ok()
+        return response.json().get('tasks') or []
+    except requests.RequestException as e:
+        _api_failed()
+        logger.error(f'Failed to get next tasks: {e}')
+        return []
+
+
 def get_upload_info(task_id: int, filename: str):
     """Get R2 upload information from backend."""
     try:
-        response = requests.put(
+        response = SESSION.put(
             f'{API_BASE_URL}/api/downloads/internal/upload-url',
-            headers=HEADERS,
             json={'task_id': task_id, 'filename': filename},
             timeout=30
         )
         response.raise_for_status()
+        _api_ok()
         return response.json()
     except requests.RequestException as e:
+        _api_failed()
         logger.error(f'Failed to get upload URL: {e}')
         return None
 
@@ -98,36 +202,94 @@ def complete_task(task_id: int, status: str, r2_key: str = None,
             'error_message': error_message,
             'file_size': kwargs.get('file_size')
         }
-        response = requests.post(
+        response = SESSION.post(
             f'{API_BASE_URL}/api/downloads/internal/complete',
-            headers=HEADERS,
             json=payload,
             timeout=30
         )
         response.raise_for_status()
+        _api_ok()
         logger.info(f'Task {task_id} marked as {status}, cookies wiped')
         return True
     except requests.RequestException as e:
+        _api_failed()
         logger.error(f'Failed to complete task: {e}')
         return False
 
 
-def upload_to_r2(file_path: str, r2_key: str) -> bool:
-    """Upload file to Cloudflare R2 using S3-compatible API."""
+R2_MULTIPART_CHUNK = 8 * 1024 * 1024
+R2_PART_CONCURRENCY = 8
+
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=R2_MULTIPART_CHUNK,
+    multipart_chunksize=R2_MULTIPART_CHUNK,
+    max_concurrency=R2_PART_CONCURRENCY,
+    use_threads=True
+)
+
+
+_S3_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _build_s3():
+    # Own Session: building clients off boto3's shared default session is not thread-safe
+    return boto3.session.Session().client(
+        's3',
+        endpoint_url=f'https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
+        aws_access_key_id=R2_ACCESS_KEY_ID,
+        aws_secret_access_key=R2_SECRET_ACCESS_KEY,
+        config=Config(
+            signature_version='s3v4',
+            # Room for every part of every concurrent upload
+            max_pool_connections=R2_PART_CONCURRENCY * UPLOAD_CONCURRENCY
+        ),
+        region_name='auto'
+    )
+
+
+def _get_s3():
+    """
+    Return the process-wide R2 client, building it on first use.
+    The lock makes sure only one thread ever constructs it; the finished
+    client is thread-safe, so all task and uploader threads share it.
+    """
+    with _S3_LOCK:
+        return _build_s3()
+
+
+def _reset_clients_after_fork():
+    """Give a forked child fresh connection pools; pooled sockets and TLS state must not be shared."""
+    global SESSION, R2_SESSION
+    SESSION = _new_api_session()
+    R2_SESSION = _new_r2_session()
+    _build_s3.cache_clear()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_clients_after_fork)
+
+
+def upload_to_r2(file_path: str, r2_key: str, put_url: str = None) -> bool:
+    """
+    Upload file to Cloudflare R2.
+    Uses the backend-issued presigned PUT URL when there is one, otherwise the
+    S3-compatible API (parallel multipart above 8MB).
+    """
     try:
-        import boto3
-        from botocore.config import Config
-        
-        s3 = boto3.client(
-            's3',
-            endpoint_url=f'https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com',
-            aws_access_key_id=R2_ACCESS_KEY_ID,
-            aws_secret_access_key=R2_SECRET_ACCESS_KEY,
-            config=Config(signature_version='s3v4'),
-            region_name='auto'
-        )
+        if put_url:
+            with open(file_path, 'rb') as f:
+                response = R2_SESSION.put(
+                    put_url,
+                    data=f,
+                    headers={'Content-Type': 'video/mp4'},
+                    timeout=(10, 600)
+                )
+            response.raise_for_status()
+            logger.info(f'Uploaded to R2 via presigned URL: {r2_key}')
+            return True
         
-        s3.upload_file(file_path, R2_BUCKET_NAME, r2_key)
+        _get_s3().upload_file(file_path, R2_BUCKET_NAME, r2_key, Config=_TRANSFER_CONFIG)
         logger.info(f'Uploaded to R2: {r2_key}')
         return True
     except Exception as e:
@@ -135,80 +297,119 @@ def upload_to_r2(file_path: str, r2_key: str) -> bool:
         return False
 
 
+class VideoTooLarge(Exception):
+    """Raised mid-stream once a video passes its size limit."""
+
+
+class _CappedReader:
+    """Read-only file object over a streamed HTTP body that counts bytes and enforces a limit."""
+
+    def __init__(self, raw, limit: int):
+        self._raw = raw
+        self.limit = limit
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._raw.read(None if size is None or size < 0 else size)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.limit:
+            raise VideoTooLarge(self.bytes_read)
+        return chunk
+
+
+def stream_to_r2(fileobj, r2_key: str) -> bool:
+    """
+    Upload a readable stream to R2 without staging it on disk.
+    VideoTooLarge propagates (the multipart upload is aborted) so the caller can report it.
+    """
+    try:
+        _get_s3().upload_fileobj(fileobj, R2_BUCKET_NAME, r2_key, Config=_TRANSFER_CONFIG)
+        logger.info(f'Streamed to R2: {r2_key}')
+        return True
+    except VideoTooLarge:
+        raise
+    except Exception as e:
+        logger.error(f'R2 upload failed: {e}')
+        return False
+
+
+DOWNLOAD_TIMEOUT = 300  # seconds per yt-dlp download
+# Refuse videos over these limits before downloading anything (0 disables a check)
+MAX_VIDEO_DURATION = int(os.environ.get('MAX_VIDEO_DURATION', '3600'))  # seconds
+MAX_VIDEO_BYTES = int(os.environ.get('MAX_VIDEO_BYTES', str(1024 * 1024 * 1024)))
+
+
 def download_video(tweet_url: str, cookies_string: str, output_dir: str) -> tuple:
     """
-    Download video using yt-dlp with the provided cookies.
+    Download video in-process with the yt-dlp API, using the provided cookies.
     Returns (success, file_path, metadata, error_message)
     """
     cookies_file = None
-    downloaded_file = None
+    deadline = time.monotonic() + DOWNLOAD_TIMEOUT
+    
+    def enforce_deadline(progress):
+        # Threads can't be killed, so the time limit is checked between fragments
+        if time.monotonic() > deadline:
+            raise DownloadCancelled('Download timed out (5 min limit)')
     
     try:
         # Create temporary cookies file in Netscape format
         cookies_file = os.path.join(output_dir, 'cookies.txt')
         write_cookies_file(cookies_file, cookies_string)
         
-        # Prepare yt-dlp command
-        output_template = os.path.join(output_dir, '%(id)s.%(ext)s')
-        
-        cmd = [
-            'yt-dlp',
-            '--cookies', cookies_file,
-            '-f', 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
-            '--merge-output-format', 'mp4',
-            '-o', output_template,
-            '--no-playlist',
-            '--print', 'after_move:filepath',  # Line 1: filepath
-            '--print', 'title',                 # Line 2: title
-            '--print', 'duration',              # Line 3: duration
-            tweet_url
-        ]
+        ydl_opts = {
+            'cookiefile': cookies_file,
+            'format': 'bestvideo[ext=mp4]+bestaudio[ext=m4a]/best[ext=mp4]/best',
+            'merge_output_format': 'mp4',
+            'outtmpl': os.path.join(output_dir, '%(id)s.%(ext)s'),
+            'noplaylist': True,
+            # Fail fast on dead links and stalled sockets instead of eating the 5 min budget
+            'socket_timeout': 30,
+            'retries': 2,
+            'fragment_retries': 2,
+            # Backstop for formats whose size only shows up in the response headers
+            'max_filesize': MAX_VIDEO_BYTES or None,
+            'quiet': True,
+            'noprogress': True,
+            'logger': logger,
+            'progress_hooks': [enforce_deadline],
+        }
         
         logger.info(f'Running yt-dlp for: {tweet_url}')
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-        
-        # Debug: log full output
-        logger.info(f'yt-dlp stdout: {result.stdout[:500] if result.stdout else "empty"}')
-        if result.stderr:
-            logger.warning(f'yt-dlp stderr: {result.stderr[:500]}')
+        with YoutubeDL(ydl_opts) as ydl:
+            # Resolve formats first so oversized videos are rejected without downloading them
+            info = ydl.extract_info(tweet_url, download=False)
+            for entry in _video_entries(info):
+                rejection = _check_video_limits(entry)
+                if rejection:
+                    return False, None, None, rejection
+            info = ydl.process_ie_result(info, download=True)
         
-        if result.returncode != 0:
-            error_msg = result.stderr or 'Unknown yt-dlp error'
-            logger.error(f'yt-dlp failed with code {result.returncode}: {error_msg}')
-            return False, None, None, error_msg[:500]
+        # Final path after merging/moving, as reported by yt-dlp itself
+        # (multi-video tweets come back as a playlist; the first video wins)
+        downloaded_file, entry = None, None
+        for entry in _video_entries(info):
+            downloads = entry.get('requested_downloads') or []
+            downloaded_file = downloads[0].get('filepath') if downloads else None
+            if downloaded_file:
+                break
         
-        # Parse output (filepath, title, duration are printed on separate lines)
-        output_lines = result.stdout.strip().split('\n') if result.stdout else []
-        logger.info(f'Output lines: {output_lines}')
-        
-        # Find the downloaded file - look for .mp4 file in temp directory
-        if len(output_lines) >= 1 and output_lines[0]:
-            downloaded_file = output_lines[0]
-            
-            # Build metadata
-            metadata = {
-                'title': output_lines[1] if len(output_lines) > 1 else None,
-                'duration': output_lines[2] if len(output_lines) > 2 else None,
-                'source_url': tweet_url
-            }
-            
-            if os.path.exists(downloaded_file):
-                logger.info(f'Downloaded: {downloaded_file}')
-                return True, downloaded_file, metadata, None
-            else:
-                logger.error(f'File not found at: {downloaded_file}')
+        if not downloaded_file or not os.path.exists(downloaded_file):
+            return False, None, None, f'No file downloaded (yt-dlp reported: {downloaded_file})'
         
-        # Fallback: scan directory for mp4 files
-        for f in os.listdir(output_dir):
-            if f.endswith('.mp4'):
-                found_file = os.path.join(output_dir, f)
-                logger.info(f'Found file via directory scan: {found_file}')
-                return True, found_file, {'source_url': tweet_url}, None
-        
-        return False, None, None, f'No file downloaded. stdout: {result.stdout[:200] if result.stdout else "empty"}'
+        metadata = {
+            'title': entry.get('title') or info.get('title'),
+            'duration': entry.get('duration'),
+            'source_url': tweet_url
+        }
+        logger.info(f'Downloaded: {downloaded_file}')
+        return True, downloaded_file, metadata, None
         
-    except subprocess.TimeoutExpired:
-        return False, None, None, 'Download timed out (5 min limit)'
+    except DownloadCancelled as e:
+        return False, None, None, str(e)
+    except DownloadError as e:
+        # Already logged through the yt-dlp logger
+        return False, None, None, str(e)[:500]
     except Exception as e:
         return False, None, None, str(e)[:500]
     finally:
@@ -218,24 +419,94 @@ def download_video(tweet_url: str, cookies_string: str, output_dir: str) -> tupl
             logger.debug('Cleaned up cookies file')
 
 
+def _video_entries(info: dict) -> list:
+    """The video dicts in a yt-dlp result: the result itself, or a playlist's entries."""
+    if not info:
+        return []
+    entries = info.get('entries')
+    if entries is None:
+        return [info]
+    return [entry for entry in entries if entry]
+
+
+def _check_video_limits(info: dict):
+    """Return an error message if the resolved video exceeds the configured limits."""
+    duration = (info or {}).get('duration') or 0
+    if MAX_VIDEO_DURATION and duration > MAX_VIDEO_DURATION:
+        return f'Video too long ({duration / 60:.0f} min > {MAX_VIDEO_DURATION / 60:.0f} min limit)'
+    
+    size = (info or {}).get('filesize') or (info or {}).get('filesize_approx') or 0
+    if MAX_VIDEO_BYTES and size > MAX_VIDEO_BYTES:
+        return f'Video too large ({size / 1024 / 1024:.0f}MB > {MAX_VIDEO_BYTES / 1024 / 1024:.0f}MB limit)'
+    
+    return None
+
+
+def _tmp_root_min_free() -> int:
+    """Free bytes WORKER_TMP_ROOT needs before a task may use it."""
+    slots = DOWNLOAD_CONCURRENCY + UPLOAD_CONCURRENCY * 2
+    return WORKER_TMP_MIN_FREE or 2 * MAX_VIDEO_BYTES * slots
+
+
+def _warn_if_tmp_root_unusable():
+    """Log once at startup when WORKER_TMP_ROOT is set but can never pass the free-space check."""
+    if not WORKER_TMP_ROOT:
+        return
+    needed = _tmp_root_min_free()
+    try:
+        total = shutil.disk_usage(WORKER_TMP_ROOT).total
+    except OSError as e:
+        logger.warning(f'WORKER_TMP_ROOT {WORKER_TMP_ROOT} is unusable ({e}); task dirs will go to disk')
+        return
+    if total < needed:
+        logger.warning(
+            f'WORKER_TMP_ROOT {WORKER_TMP_ROOT} is {total / 1024 / 1024:.0f}MB but needs '
+            f'{needed / 1024 / 1024:.0f}MB free, so it will never be used; '
+            f'set WORKER_TMP_MIN_FREE_MB to a size it can hold'
+        )
+
+
+def make_task_dir(use_tmp_root: bool = True) -> str:
+    """
+    Create a per-task temp directory. Uses WORKER_TMP_ROOT when configured and it
+    has room for a worst-case merge (video + audio + merged output, ~2x the size
+    limit) for every task slot and queued upload; otherwise the default temp dir.
+    """
+    if use_tmp_root and WORKER_TMP_ROOT:
+        try:
+            if shutil.disk_usage(WORKER_TMP_ROOT).free >= _tmp_root_min_free():
+                return tempfile.mkdtemp(dir=WORKER_TMP_ROOT)
+        except OSError:
+            pass  # Missing or unwritable: fall back to disk
+    return tempfile.mkdtemp()
+
+
+def _on_tmp_root(path: str) -> bool:
+    return bool(WORKER_TMP_ROOT) and os.path.dirname(path) == os.path.abspath(WORKER_TMP_ROOT)
+
+
 def write_cookies_file(filepath: str, cookies_string: str):
     """
     Write cookies in Netscape format for yt-dlp.
     Input format: "auth_token=xxx; ct0=yyy"
     """
-    with open(filepath, 'w') as f:
-        f.write('# Netscape HTTP Cookie File\n')
-        f.write('# https://curl.haxx.se/rfc/cookie_spec.html\n\n')
-        
-        # Parse cookie string
-        for cookie in cookies_string.split(';'):
-            cookie = cookie.strip()
-            if '=' in cookie:
-                name, value = cookie.split('=', 1)
-                # Format: domain, flag, path, secure, expiry, name, value
-                f.write(f'.x.com\tTRUE\t/\tTRUE\t0\t{name}\t{value}\n')
-                # Also add twitter.com domain
-                f.write(f'.twitter.com\tTRUE\t/\tTRUE\t0\t{name}\t{value}\n')
+    lines = [
+        '# Netscape HTTP Cookie File\n',
+        '# https://curl.haxx.se/rfc/cookie_spec.html\n\n',
+    ]
+    
+    # Parse cookie string
+    for cookie in cookies_string.split(';'):
+        cookie = cookie.strip()
+        if '=' in cookie:
+            name, value = cookie.split('=', 1)
+            # Format: domain, flag, path, secure, expiry, name, value
+            lines.append(f'.x.com\tTRUE\t/\tTRUE\t0\t{name}\t{value}\n')
+            # Also add twitter.com domain
+            lines.append(f'.twitter.com\tTRUE\t/\tTRUE\t0\t{name}\t{value}\n')
+    
+    # One write for the whole file
+    Path(filepath).write_text(''.join(lines))
 
 
 def process_task(task: dict):
@@ -251,7 +522,7 @@ def process_task(task: dict):
 def process_snapshot_video_task(task: dict):
     """
     Process a snapshot video task.
-    Downloads video directly from CDN URL (no yt-dlp needed).
+    Streams the video directly from the CDN URL into R2 (no yt-dlp, no temp file).
     """
     task_id = task['id']
     video_url = task.get('video_url')
@@ -265,35 +536,26 @@ def process_snapshot_video_task(task: dict):
         complete_task(task_id, 'failed', error_message='No video URL provided')
         return
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            # Step 1: Download video directly from CDN
-            logger.info(f'Downloading video from: {video_url[:80]}...')
-            
-            response = requests.get(video_url, stream=True, timeout=300, headers={
-                'User-Agent': 'TidyFeed/1.0 (Video Cache)'
-            })
+    # Size limit for snapshot videos
+    max_size = 50 * 1024 * 1024
+    
+    try:
+        # Step 1: Open the CDN stream
+        logger.info(f'Downloading video from: {video_url[:80]}...')
+        
+        response = requests.get(video_url, stream=True, timeout=300, headers={
+            'User-Agent': 'TidyFeed/1.0 (Video Cache)'
+        })
+        with response:
             response.raise_for_status()
             
-            # Save to temp file
-            file_path = os.path.join(temp_dir, f'{tweet_id}.mp4')
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            file_size = os.path.getsize(file_path)
-            logger.info(f'Downloaded {file_size / 1024 / 1024:.2f} MB')
-            
-            # Check size limit (50MB for snapshot videos)
-            max_size = 50 * 1024 * 1024
-            if file_size > max_size:
-                logger.warning(f'Video too large ({file_size / 1024 / 1024:.2f} MB), skipping')
-                complete_task(task_id, 'failed', error_message=f'Video too large ({file_size / 1024 / 1024:.0f}MB > 50MB limit)')
-                return
+            # Reject up front when the CDN advertises the size
+            content_length = int(response.headers.get('Content-Length') or 0)
+            if content_length > max_size:
+                raise VideoTooLarge(content_length)
             
-            # Step 2: Get upload destination
-            filename = os.path.basename(file_path)
-            upload_info = get_upload_info(task_id, filename)
+            # Step 2: Get upload destination (the key depends only on the task and extension)
+            upload_info = get_upload_info(task_id, f'{tweet_id}.mp4')
             
             if not upload_info:
                 complete_task(task_id, 'failed', error_message='Failed to get upload URL')
@@ -301,26 +563,35 @@ def process_snapshot_video_task(task: dict):
             
             r2_key = upload_info['key']
             
-            # Step 3: Upload to R2
-            if not upload_to_r2(file_path, r2_key):
+            # Step 3: Pipe the response body straight into a multipart upload
+            response.raw.decode_content = True
+            body = _CappedReader(response.raw, max_size)
+            if not stream_to_r2(body, r2_key):
                 complete_task(task_id, 'failed', error_message='Upload to R2 failed')
                 return
-            
-            # Step 4: Mark as completed
-            metadata = {
-                'source_url': video_url,
-                'tweet_id': tweet_id,
-                'type': 'snapshot_video'
-            }
-            complete_task(task_id, 'completed', r2_key=r2_key, metadata=metadata, file_size=file_size)
-            logger.info(f'Snapshot video task {task_id} completed successfully')
-            
-        except requests.RequestException as e:
-            logger.error(f'Download failed: {e}')
-            complete_task(task_id, 'failed', error_message=f'Download failed: {str(e)[:200]}')
-        except Exception as e:
-            logger.error(f'Unexpected error: {e}')
-            complete_task(task_id, 'failed', error_message=f'Error: {str(e)[:200]}')
+        
+        file_size = body.bytes_read
+        logger.info(f'Uploaded {file_size / 1024 / 1024:.2f} MB')
+        
+        # Step 4: Mark as completed
+        metadata = {
+            'source_url': video_url,
+            'tweet_id': tweet_id,
+            'type': 'snapshot_video'
+        }
+        complete_task(task_id, 'completed', r2_key=r2_key, metadata=metadata, file_size=file_size)
+        logger.info(f'Task {task_id} completed successfully')
+        
+    except VideoTooLarge as e:
+        file_size = e.args[0]
+        logger.warning(f'Video too large ({file_size / 1024 / 1024:.2f} MB), skipping')
+        complete_task(task_id, 'failed', error_message=f'Video too large ({file_size / 1024 / 1024:.0f}MB > 50MB limit)')
+    except requests.RequestException as e:
+        logger.error(f'Download failed: {e}')
+        complete_task(task_id, 'failed', error_message=f'Download failed: {str(e)[:200]}')
+    except Exception as e:
+        logger.error(f'Unexpected error: {e}')
+        complete_task(task_id, 'failed', error_message=f'Error: {str(e)[:200]}')
 
 
 def process_user_download_task(task: dict):
@@ -338,20 +609,54 @@ def process_user_download_task(task: dict):
         complete_task(task_id, 'failed', error_message='Cookies not available')
         return
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Step 1: Download video
+    temp_dir = make_task_dir()
+    try:
+        # Step 1: Download video (the cookies file is removed before this returns)
         success, file_path, metadata, error_msg = download_video(
             tweet_url, cookies_string, temp_dir
         )
         
+        if not success and _on_tmp_root(temp_dir) and 'No space left' in (error_msg or ''):
+            # The RAM dir filled up mid-download/merge: retry once on disk
+            logger.warning(f'Task {task_id}: {WORKER_TMP_ROOT} is full, retrying on disk')
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            temp_dir = make_task_dir(use_tmp_root=False)
+            success, file_path, metadata, error_msg = download_video(
+                tweet_url, cookies_string, temp_dir
+            )
+        
         if not success:
             logger.error(f'Task {task_id} failed: {error_msg}')
             complete_task(task_id, 'failed', error_message=error_msg)
             return
         
+        # Steps 2-4 run on an uploader thread
+        file_size = os.path.getsize(file_path)
+        submit_upload(task_id, temp_dir, file_path, metadata, file_size)
+        temp_dir = None  # Owned by the upload stage now
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def submit_upload(task_id: int, temp_dir: str, file_path: str, metadata: dict, file_size: int):
+    """
+    Hand a downloaded file to the upload pool and return so the caller can
+    start its next download. Blocks while all upload slots are taken.
+    """
+    UPLOAD_SLOTS.acquire()
+    try:
+        UPLOAD_POOL.submit(_upload_and_complete, task_id, temp_dir, file_path, metadata, file_size)
+    except BaseException:
+        UPLOAD_SLOTS.release()
+        raise
+
+
+def _upload_and_complete(task_id: int, temp_dir: str, file_path: str, metadata: dict, file_size: int):
+    """Upload stage: push the file to R2, complete the task, then delete the temp dir."""
+    try:
         # Step 2: Get upload destination
         filename = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
         upload_info = get_upload_info(task_id, filename)
         
         if not upload_info:
@@ -361,38 +666,105 @@ def process_user_download_task(task: dict):
         r2_key = upload_info['key']
         
         # Step 3: Upload to R2
-        if not upload_to_r2(file_path, r2_key):
+        if not upload_to_r2(file_path, r2_key, upload_info.get('put_url')):
             complete_task(task_id, 'failed', error_message='Upload to R2 failed')
             return
         
         # Step 4: Mark as completed (THIS WIPES THE COOKIES!)
         complete_task(task_id, 'completed', r2_key=r2_key, metadata=metadata, file_size=file_size)
         logger.info(f'Task {task_id} completed successfully')
+    except Exception as e:
+        logger.error(f'Unexpected error: {e}')
+        complete_task(task_id, 'failed', error_message=f'Error: {str(e)[:200]}')
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        UPLOAD_SLOTS.release()
 
 
 
-def main():
-    """Main worker loop."""
+def _reap(done):
+    """Log any exception that escaped a finished task."""
+    for future in done:
+        exc = future.exception()
+        if exc:
+            logger.error(f'Task crashed: {exc}')
+
+
+def main(stop: threading.Event = None):
+    """Main worker loop. Runs until `stop` is set (forever when run standalone)."""
+    stop = stop or threading.Event()
+    
     logger.info('=' * 50)
     logger.info('TidyFeed Cloud Video Downloader Worker')
     logger.info(f'API: {API_BASE_URL}')
-    logger.info(f'Poll interval: {POLL_INTERVAL}s')
+    logger.info(f'Poll interval: {POLL_INTERVAL}s (backs off to {MAX_POLL_INTERVAL}s when idle)')
+    logger.info(f'Concurrent tasks: {DOWNLOAD_CONCURRENCY}')
     logger.info('=' * 50)
+    _warn_if_tmp_root_unusable()
+    
+    current_interval = POLL_INTERVAL
+    executor = ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY, thread_name_prefix='task')
+    inflight = set()
     
-    while True:
+    while not stop.is_set():
         try:
-            task = get_next_task()
+            if len(inflight) >= DOWNLOAD_CONCURRENCY:
+                # All slots busy: block until one frees up before claiming more work
+                done, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+                _reap(done)
+                continue
             
-            if task:
-                process_task(task)
+            done = {f for f in inflight if f.done()}
+            inflight -= done
+            _reap(done)
+            
+            started = time.monotonic()
+            tasks = get_next_tasks(DOWNLOAD_CONCURRENCY - len(inflight))
+            
+            if tasks:
+                for task in tasks:
+                    inflight.add(executor.submit(process_task, task))
+                current_interval = POLL_INTERVAL
+                continue  # Fill the remaining slots straight away
+            elif _api_failures:
+                # Backend failing: open the circuit for a while, then probe again with the next poll
+                current_interval = min(POLL_INTERVAL * 2 ** min(_api_failures, 6), MAX_FAILURE_INTERVAL)
+                logger.warning(f'{_api_failures} consecutive API failures, next poll in ~{current_interval}s')
+            elif LONG_POLL_WAIT and time.monotonic() - started >= LONG_POLL_WAIT * 0.8:
+                # The backend held the request open for us: it already waited, so ask again now
+                logger.debug('No pending tasks (long-poll expired)')
+                current_interval = POLL_INTERVAL
+                continue
             else:
                 logger.debug('No pending tasks')
+                current_interval = min(current_interval * 2, MAX_POLL_INTERVAL)
             
         except Exception as e:
             logger.error(f'Worker error: {e}')
         
-        time.sleep(POLL_INTERVAL)
+        # +/-20% jitter so replicas don't poll in lockstep; wakes early on stop
+        stop.wait(current_interval * (0.8 + 0.4 * random.random()))
+    
+    # Let claimed tasks finish (download, then upload) so they aren't re-run after a restart
+    logger.info(f'Video worker stopped polling, draining {len(inflight)} in-flight task(s)...')
+    executor.shutdown(wait=True)
+    UPLOAD_POOL.shutdown(wait=True)
+    logger.info('Video worker stopped')
+
+
+def install_signal_handlers(stop: threading.Event):
+    """SIGTERM/SIGINT request a graceful stop; a second signal exits immediately."""
+    def handle(signum, frame):
+        if stop.is_set():
+            os._exit(128 + signum)
+        logger.info(f'Received {signal.Signals(signum).name}, finishing in-flight tasks (send again to force exit)')
+        stop.set()
+    
+    signal.signal(signal.SIGTERM, handle)
+    signal.signal(signal.SIGINT, handle)
 
 
 if __name__ == '__main__':
-    main()
+    stop = threading.Event()
+    install_signal_handlers(stop)
+    main(stop)